@@ -6,7 +6,12 @@ from loguru import logger
 from typing import List, Dict, Any, Optional
 import yaml
 import json
-from .utils import instantiate, load_python_defaults, extract_tracking_info
+from .utils import (
+    instantiate,
+    load_python_defaults,
+    extract_tracking_info,
+    YamlLoader,
+)
 from .snapshot import snapshot, RunTracker
 from .diff import RunDiff
 from . import config
@@ -168,7 +173,7 @@ class Project:
                 try:
                     # Load candidate snapshot
                     with open(lock_file, "r") as f:
-                        candidate_snapshot = yaml.safe_load(f)
+                        candidate_snapshot = yaml.load(f, Loader=YamlLoader)
 
                     # Extract save_dir from both snapshots for normalization
                     proposed_save_dir = fingerprint.get("config", {}).get("save_dir")
@@ -248,7 +253,7 @@ class Project:
         lock_file = match_dir / "run.lock"
         if result_data is None and lock_file.exists():
             with open(lock_file, "r") as f:
-                lock_data = yaml.safe_load(f)
+                lock_data = yaml.load(f, Loader=YamlLoader)
                 result_data = lock_data.get("result", {})
 
         return ExecutionResult(
@@ -292,12 +297,21 @@ class Project:
         """
         Save the current project defaults as pipeline.yaml.
 
+        The file is left untouched when its content is already up to date.
+
         Args:
             save_dir: Directory to save the pipeline snapshot to
         """
         save_path = Path(save_dir)
         save_path.mkdir(parents=True, exist_ok=True)
-        (save_path / "pipeline.yaml").write_text(OmegaConf.to_yaml(self.defaults))
+        pipeline_file = save_path / "pipeline.yaml"
+        content = OmegaConf.to_yaml(self.defaults).encode()
+        try:
+            if pipeline_file.read_bytes() == content:
+                return
+        except FileNotFoundError:
+            pass
+        pipeline_file.write_bytes(content)
 
     def submit(
         self,
@@ -6,13 +6,15 @@ import sys
 import yaml
 from datetime import datetime
 from pathlib import Path
-from git.repo import Repo as GitRepo
 
 from .git_utils import sanitize_ref_name
+from .utils import YamlLoader
 
 
 def find_git_repo(start_path="."):
     """Find the git repository from the given path."""
+    from git.repo import Repo as GitRepo
+
     try:
         return GitRepo(start_path, search_parent_directories=True)
     except Exception:
@@ -26,7 +28,7 @@ def find_results_dirs(root="."):
         run_dir = lock_file.parent
         try:
             with open(lock_file) as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=YamlLoader)
             results.append({
                 "path": str(run_dir),
                 "timestamp": data.get("timestamp", ""),
@@ -128,7 +130,7 @@ def collect_lineage_refs(repo, run_dir):
     if lock_file.exists():
         try:
             with open(lock_file) as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=YamlLoader)
 
             # Get shadow refs from repos recorded in run.lock
             repos_data = data.get("repos", {})
@@ -425,7 +427,7 @@ def _collect_lineage_paths(run_path, protected):
 
     try:
         with open(lock_file) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=YamlLoader)
         lineage = data.get("lineage") or data.get("prevs", {})
         for nested_data in lineage.values():
             nested_path = nested_data.get("path") or nested_data.get("config", {}).get("save_dir")
@@ -47,6 +47,9 @@ POLL_INTERVAL = get_env_int("FLEXLOCK_POLL_INTERVAL", 10)
 # Log frequency for progress updates (seconds)
 LOG_FREQUENCY = get_env_int("FLEXLOCK_LOG_FREQUENCY", 15)
 
+# Upper bound (seconds) of the idle back-off used by workers waiting for a task
+WORKER_MAX_IDLE_SLEEP = get_env_float("FLEXLOCK_WORKER_MAX_IDLE_SLEEP", 5.0)
+
 # Default number of parallel jobs
 DEFAULT_N_JOBS = get_env_int("FLEXLOCK_DEFAULT_N_JOBS", 1)
 
@@ -1,12 +1,16 @@
 """Data hashing utilities for FlexLock."""
 
+import fnmatch
 import os
+import re
 import sqlite3
+import stat
 import threading
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePath
 import xxhash
 import hashlib
-from joblib import Parallel, delayed
+import mmap
 from contextlib import contextmanager
 
 # --- Cache Configuration ---
@@ -25,6 +29,50 @@ DEFAULT_DIR_FILE_LIMIT = os.environ.get("FLEXLOCK_DIR_FILE_LIMIT", 1000)
 # Thread-local storage for database connections
 _thread_local_conns = threading.local()
 
+# In-process memo of file hashes keyed by (path, mtime_ns, size): repeated
+# lookups of an unchanged file skip both hashing and the SQLite round-trip.
+_FILE_HASH_MEMO: dict = {}
+_FILE_HASH_MEMO_SIZE = 4096
+_file_hash_memo_lock = threading.Lock()
+
+
+def _memoize_file_hash(key, value):
+    """Stores a file hash in the in-process memo, evicting the oldest entry if full."""
+    with _file_hash_memo_lock:
+        if len(_FILE_HASH_MEMO) >= _FILE_HASH_MEMO_SIZE:
+            _FILE_HASH_MEMO.pop(next(iter(_FILE_HASH_MEMO)))
+        _FILE_HASH_MEMO[key] = value
+    return value
+
+
+_CACHE_COLUMNS = (
+    "path", "mtime", "file_count", "latest_mtime", "hash", "is_dir", "size", "mtime_ns"
+)
+# Upsert that leaves an identical row untouched, so concurrent runs hashing
+# the same data do not each rewrite its page into the WAL.
+_UPSERT_CACHE_ROW = (
+    f"INSERT INTO cache ({', '.join(_CACHE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_CACHE_COLUMNS))}) "
+    "ON CONFLICT(path) DO UPDATE SET "
+    + ", ".join(f"{c}=excluded.{c}" for c in _CACHE_COLUMNS[1:])
+    + f" WHERE ({', '.join(_CACHE_COLUMNS[1:])})"
+    + f" IS NOT ({', '.join('excluded.' + c for c in _CACHE_COLUMNS[1:])})"
+)
+
+
+def _add_missing_columns(conn):
+    """Upgrades a cache table created before the size/mtime_ns columns existed."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(cache)")}
+    for name in ("size", "mtime_ns"):
+        if name not in columns:
+            try:
+                conn.execute(f"ALTER TABLE cache ADD COLUMN {name} INTEGER")
+            except sqlite3.OperationalError as e:
+                # Another process may have upgraded the table concurrently
+                if "duplicate column" not in str(e):
+                    raise
+    conn.commit()
+
 
 @contextmanager
 def _get_db():
@@ -36,7 +84,9 @@ def _get_db():
     with the same path within that thread.
     """
     # Use the absolute path as a reliable key for the connections dictionary.
-    db_path_str = str(CACHE_DB.resolve())
+    # abspath is pure string work, unlike resolve() which lstat's every
+    # component on each hash lookup.
+    db_path_str = os.path.abspath(CACHE_DB)
 
     # Initialize the connections dictionary for the current thread if it doesn't exist.
     if not hasattr(_thread_local_conns, "conns"):
@@ -50,6 +100,9 @@ def _get_db():
             # Set PRAGMA for better performance and concurrency.
             c.execute("PRAGMA journal_mode=WAL")
             c.execute("PRAGMA busy_timeout=15000")
+            # In WAL mode NORMAL only syncs at checkpoints, sparing an fsync
+            # per cached hash; a lost entry is simply recomputed.
+            c.execute("PRAGMA synchronous=NORMAL")
             c.execute(
                 "PRAGMA foreign_keys=ON"
             )  # Good practice to enforce foreign key constraints
@@ -61,10 +114,13 @@ def _get_db():
                     file_count INTEGER,
                     latest_mtime REAL,
                     hash TEXT,
-                    is_dir INTEGER
+                    is_dir INTEGER,
+                    size INTEGER,
+                    mtime_ns INTEGER
                 )
                 """
             )
+            _add_missing_columns(c)
             _thread_local_conns.conns[db_path_str] = c
         except sqlite3.Error as e:
             print(f"Error connecting to database {db_path_str}: {e}")
@@ -78,34 +134,59 @@ def _get_db():
         pass
 
 
+# Files below this size are read in one go; larger ones are memory-mapped
+_MMAP_MIN_SIZE = 1 << 20
+
+
 def _hash_file_content(path):
     """Hashes a single file using XXHash."""
-    hasher = xxhash.xxh64()
     with open(path, "rb") as f:
-        while chunk := f.read(65536):
-            hasher.update(chunk)
-    return hasher.hexdigest()
+        size = os.fstat(f.fileno()).st_size
+        if size < _MMAP_MIN_SIZE:
+            return xxhash.xxh64_hexdigest(f.read())
+        # Hand the whole mapping to the C hasher: no per-chunk copies or calls
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return xxhash.xxh64_hexdigest(mm)
 
 
-def _get_dir_stats(path: Path, limit: int):
+def _get_dir_stats(path: str | Path, limit: int, root_mtime: float | None = None):
     """
     Walks a directory to get the file count and the latest modification time.
 
     If the file count exceeds the limit, it returns (limit + 1, 0) to signal
-    that the directory is "large".
+    that the directory is "large". ``root_mtime`` can be passed when the
+    caller already stat'ed ``path``.
     """
     count = 0
-    latest_mtime = path.stat().st_mtime
+    latest_mtime = os.stat(path).st_mtime if root_mtime is None else root_mtime
+
+    # Iterative scandir walk with os.walk semantics (symlinked directories
+    # are not followed); DirEntry avoids a Path object per file.
+    stack = [os.fspath(path)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        files = []
+        with it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry)
+                elif not entry.is_symlink():
+                    stack.append(entry.path)
 
-    for root, _, files in os.walk(path):
         count += len(files)
         if count > limit:
             return count, 0  # Exceeded limit, fallback mode
 
-        for name in files:
-            filepath = Path(root) / name
+        for entry in files:
             try:
-                mtime = filepath.stat().st_mtime
+                mtime = entry.stat().st_mtime
                 if mtime > latest_mtime:
                     latest_mtime = mtime
             except OSError:
@@ -114,6 +195,35 @@ def _get_dir_stats(path: Path, limit: int):
     return count, latest_mtime
 
 
+def _compile_path_patterns(patterns):
+    """
+    Precompiles glob patterns with the semantics of ``Path.match``.
+
+    Relative patterns match from the right, one path component per pattern
+    component; absolute patterns must match the whole path. Like
+    ``Path.match``, an empty pattern (``""`` or ``"."``) raises ValueError.
+    """
+    compiled = []
+    for pattern in patterns:
+        pure = PurePath(pattern)
+        if not pure.parts:
+            raise ValueError("empty pattern")
+        matchers = [re.compile(fnmatch.translate(part)).match for part in pure.parts]
+        compiled.append((pure.is_absolute(), matchers[::-1]))
+    return compiled
+
+
+def _matches_any(path: Path, compiled) -> bool:
+    """Returns True if ``path`` matches one of the precompiled patterns."""
+    parts = path.parts
+    for is_absolute, matchers in compiled:
+        if len(parts) < len(matchers) or (is_absolute and len(parts) != len(matchers)):
+            continue
+        if all(m(part) for m, part in zip(matchers, reversed(parts))):
+            return True
+    return False
+
+
 def dirhash(
     path, match=None, ignore=None, jobs=1, algorithm=hashlib.md5, chunk_size=65536
 ):
@@ -133,9 +243,6 @@ def dirhash(
     if isinstance(ignore_patterns, str):
         ignore_patterns = [ignore_patterns]
 
-    import glob
-    from pathlib import Path as p_path
-
     # Find all files matching patterns
     files_to_hash = []
     for pattern in match_pattern:
@@ -143,16 +250,12 @@ def dirhash(
 
     files_to_hash = [f for f in files_to_hash if f.is_file()]
 
-    # Apply ignore patterns
-    final_files = []
-    for f in files_to_hash:
-        should_ignore = False
-        for pattern in ignore_patterns:
-            if f.match(pattern):
-                should_ignore = True
-                break
-        if not should_ignore:
-            final_files.append(f)
+    # Apply ignore patterns (compiled once, single pass over the files)
+    if ignore_patterns:
+        compiled = _compile_path_patterns(ignore_patterns)
+        final_files = [f for f in files_to_hash if not _matches_any(f, compiled)]
+    else:
+        final_files = files_to_hash
 
     if not final_files:
         return algorithm().hexdigest()
@@ -168,13 +271,24 @@ def dirhash(
                 hasher.update(data)
         return hasher.hexdigest()
 
-    file_hashes = Parallel(n_jobs=jobs)(
-        delayed(_hash_file)(str(f), algorithm, chunk_size) for f in final_files
-    )
+    # Hashing runs in C and releases the GIL on large buffers, so threads
+    # overlap IO and hashing without the cost of spawning worker processes.
+    # jobs follows the joblib convention: negative values count from cpu_count.
+    jobs = jobs or 1
+    n_workers = jobs if jobs > 0 else max(1, (os.cpu_count() or 1) + 1 + jobs)
+    n_workers = min(n_workers, len(final_files))
+    if n_workers <= 1:
+        file_hashes = [_hash_file(f, algorithm, chunk_size) for f in final_files]
+    else:
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            file_hashes = list(
+                pool.map(lambda f: _hash_file(f, algorithm, chunk_size), final_files)
+            )
 
+    # Streaming hashes are concatenation-invariant: one update over the joined
+    # digests gives the same result as one update per file, minus N calls
     final_hasher = algorithm()
-    for h in sorted(file_hashes):
-        final_hasher.update(h.encode("utf-8"))
+    final_hasher.update("".join(sorted(file_hashes)).encode("utf-8"))
 
     return final_hasher.hexdigest()
 
@@ -191,7 +305,17 @@ def hash_data(
     """
     Computes a hash for a file or a directory, using an SQLite cache to avoid re-computation.
     """
-    path = Path(path).resolve()
+    # Canonical string key: realpath gives the same result as Path.resolve()
+    # without the Path round trips on every lookup
+    path = os.path.realpath(path)
+    # Stat once and reuse the result for type checks and cache validation
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"The specified path does not exist: {path}")
+    is_file = stat.S_ISREG(st.st_mode)
+    is_dir = stat.S_ISDIR(st.st_mode)
+
     use_cache = os.environ.get("FLEXLOCK_NO_CACHE", use_cache) not in (
         "1",
         "true",
@@ -201,28 +325,38 @@ def hash_data(
         os.environ.get("FLEXLOCK_CACHE_DIR_FILE_LIMIT", DEFAULT_DIR_FILE_LIMIT)
     )
 
+    memo_key = None
+    # Directory stats gathered for the cache lookup, reused when storing
+    dir_stats = None
+    if use_cache and is_file:
+        memo_key = (path, st.st_mtime_ns, st.st_size)
+        memo_hash = _FILE_HASH_MEMO.get(memo_key)
+        if memo_hash is not None:
+            return memo_hash
+
     if use_cache:
         with _get_db() as conn:
             cursor = conn.cursor()
 
-            if path.is_file():
+            if is_file:
                 # Check cache for file
+                # Validate on the exact integer mtime and the size: a float
+                # mtime can round away sub-microsecond changes
                 cursor.execute(
-                    "SELECT hash, mtime FROM cache WHERE path=? AND is_dir=0",
-                    (str(path),),
+                    "SELECT hash, mtime_ns, size FROM cache WHERE path=? AND is_dir=0",
+                    (path,),
                 )
                 row = cursor.fetchone()
 
                 if row:
-                    cached_hash, cached_mtime = row
-                    current_mtime = path.stat().st_mtime
-                    if cached_mtime == current_mtime:
-                        return cached_hash
-            elif path.is_dir():
+                    cached_hash, cached_mtime_ns, cached_size = row
+                    if (cached_mtime_ns, cached_size) == (st.st_mtime_ns, st.st_size):
+                        return _memoize_file_hash(memo_key, cached_hash)
+            elif is_dir:
                 # Check cache for directory
                 cursor.execute(
                     "SELECT hash, mtime, file_count, latest_mtime FROM cache WHERE path=? AND is_dir=1",
-                    (str(path),),
+                    (path,),
                 )
                 row = cursor.fetchone()
 
@@ -233,12 +367,12 @@ def hash_data(
                         cached_file_count,
                         cached_latest_mtime,
                     ) = row
-                    file_count, latest_mtime = _get_dir_stats(path, dir_file_limit)
+                    dir_stats = _get_dir_stats(path, dir_file_limit, st.st_mtime)
+                    file_count, latest_mtime = dir_stats
 
                     if file_count > dir_file_limit:
                         # Large directory fallback
-                        current_mtime = path.stat().st_mtime
-                        if cached_mtime == current_mtime:
+                        if cached_mtime == st.st_mtime:
                             return cached_hash
                     else:
                         if (
@@ -248,13 +382,10 @@ def hash_data(
                             return cached_hash
 
     # If not in cache or cache is invalid/disabled, compute the hash
-    if not path.exists():
-        raise FileNotFoundError(f"The specified path does not exist: {path}")
-
     new_hash = None
-    if path.is_file():
+    if is_file:
         new_hash = _hash_file_content(path)
-    elif path.is_dir():
+    elif is_dir:
         new_hash = dirhash(
             path,
             match=match,
@@ -271,27 +402,26 @@ def hash_data(
     if use_cache:
         with _get_db() as conn:
             cursor = conn.cursor()
-            if path.is_file():
-                mtime = path.stat().st_mtime
-                cursor.execute(
-                    "INSERT OR REPLACE INTO cache VALUES (?, ?, NULL, NULL, ?, 0)",
-                    (str(path), mtime, new_hash),
-                )
-            elif path.is_dir():
-                file_count, latest_mtime = _get_dir_stats(path, dir_file_limit)
-                mtime = path.stat().st_mtime
+            # Store the mtime observed before hashing: if the data changed
+            # meanwhile, the next lookup sees a mismatch and recomputes.
+            mtime = st.st_mtime
+            if is_file:
+                row = (path, mtime, None, None, new_hash, 0, st.st_size, st.st_mtime_ns)
+            else:
+                # Like mtime, stats taken before hashing are the safe ones to
+                # store: a change made meanwhile invalidates the entry
+                if dir_stats is None:
+                    dir_stats = _get_dir_stats(path, dir_file_limit, st.st_mtime)
+                file_count, latest_mtime = dir_stats
                 if file_count > dir_file_limit:
                     # For large directories, use just the directory's mtime
-                    cursor.execute(
-                        "INSERT OR REPLACE INTO cache VALUES (?, ?, NULL, NULL, ?, 1)",
-                        (str(path), mtime, new_hash),
-                    )
+                    row = (path, mtime, None, None, new_hash, 1, None, None)
                 else:
                     # For smaller directories, cache more detailed stats
-                    cursor.execute(
-                        "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, 1)",
-                        (str(path), mtime, file_count, latest_mtime, new_hash),
-                    )
+                    row = (path, mtime, file_count, latest_mtime, new_hash, 1, None, None)
+            cursor.execute(_UPSERT_CACHE_ROW, row)
             conn.commit()
+        if memo_key is not None:
+            _memoize_file_hash(memo_key, new_hash)
 
     return new_hash
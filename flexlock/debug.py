@@ -80,11 +80,13 @@ def _is_project_frame(filename: str) -> bool:
         return False
 
     try:
-        p = Path(filename).resolve()
-        cwd = Path.cwd().resolve()
-        return p.is_relative_to(cwd)
+        # Plain string prefix check on resolved paths; avoids building the
+        # parts tuples Path.is_relative_to compares for every frame
+        path = os.path.realpath(filename)
+        cwd = os.path.realpath(os.getcwd())
     except (OSError, ValueError, RuntimeError):
         return False
+    return path == cwd or path.startswith(cwd.rstrip(os.sep) + os.sep)
 
 
 def _score_frame(frame_info: Dict[str, Any]) -> int:
@@ -391,6 +393,17 @@ def _handle_exception_debug(exc_info):
             pdb.post_mortem(exc_info[2])
 
 
+def _debug_enabled() -> bool:
+    """
+    Check FLEXLOCK_DEBUG.
+
+    Read at call time rather than import time: users and tests set or clear
+    the variable after flexlock has been imported.
+    """
+    value = os.environ.get("FLEXLOCK_DEBUG")
+    return value is not None and value.lower() in ("1", "true")
+
+
 def debug_on_fail(fn=None):
     """
     A decorator that provides enhanced debugging on exception.
@@ -68,10 +68,16 @@ class RunDiff:
             Normalized value
         """
         logger.debug(
-            f"Normalizing value: {val} with root_dir: {root_dir}, {type(val)} {type(root_dir)}"
+            "Normalizing value: {} with root_dir: {}, {} {}",
+            val,
+            root_dir,
+            type(val),
+            type(root_dir),
         )
         if root_dir and isinstance(val, str) and root_dir in val:
-            logger.debug(f"Value '{val}' contains root_dir '{root_dir}', normalizing.")
+            logger.debug(
+                "Value '{}' contains root_dir '{}', normalizing.", val, root_dir
+            )
             return val.replace(root_dir, "<SAVE_DIR>")
         return val
 
@@ -121,9 +127,9 @@ class RunDiff:
         Returns True if no relevant files differ, False otherwise.
         """
         try:
-            from git.repo import Repo as GitRepo
+            from .git_utils import _repo_for
 
-            repo = GitRepo(repo_path, search_parent_directories=True)
+            repo = _repo_for(repo_path)
 
             # Build git pathspec: include patterns + :(exclude) patterns
             pathspec = list(include or [])
@@ -183,7 +189,12 @@ class RunDiff:
             else:
                 # Value Comparison with Normalization
                 logger.debug(
-                    f"Comparing values at {path}: {d1} vs {d2} after normalization with dirs {self.c_dir}, {self.t_dir}"
+                    "Comparing values at {}: {} vs {} after normalization with dirs {}, {}",
+                    path,
+                    d1,
+                    d2,
+                    self.c_dir,
+                    self.t_dir,
                 )
 
                 v1_norm = self._normalize_val(d1, self.c_dir)
@@ -7,6 +7,7 @@ from pathlib import Path
 from loguru import logger
 from flexlock.diff import RunDiff
 from flexlock.taskdb import get_task_snapshot
+from flexlock.utils import YamlLoader
 
 
 def load_snapshot_from_dir(dir_path: Path) -> dict:
@@ -16,7 +17,7 @@ def load_snapshot_from_dir(dir_path: Path) -> dict:
         raise FileNotFoundError(f"No run.lock found in {dir_path}")
 
     with open(lock_file) as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=YamlLoader)
 
 
 def load_snapshot_from_db(db_path: Path, task_id: str) -> dict:
@@ -9,6 +9,7 @@ import os
 from pathlib import Path
 from loguru import logger
 from flexlock.taskdb import get_task_snapshot, list_task_snapshots
+from flexlock.utils import YamlDumper
 
 
 def export_task(db_path: Path, task_id: str, output_dir: Path) -> None:
@@ -31,7 +32,7 @@ def export_task(db_path: Path, task_id: str, output_dir: Path) -> None:
 
     # Atomic write of run.lock file
     with tempfile.NamedTemporaryFile("w", dir=output_dir, delete=False) as tf:
-        yaml.dump(snapshot_data, tf, sort_keys=False)
+        yaml.dump(snapshot_data, tf, Dumper=YamlDumper, sort_keys=False)
         tmp_name = tf.name
     os.replace(tmp_name, output_dir / "run.lock")
 
@@ -67,7 +68,7 @@ def export_all_tasks(db_path: Path, output_base_dir: Path, status: str = None) -
             with tempfile.NamedTemporaryFile(
                 "w", dir=task_output_dir, delete=False
             ) as tf:
-                yaml.dump(snapshot_data, tf, sort_keys=False)
+                yaml.dump(snapshot_data, tf, Dumper=YamlDumper, sort_keys=False)
                 tmp_name = tf.name
             os.replace(tmp_name, task_output_dir / "run.lock")
 
@@ -1,14 +1,13 @@
 """Configuration decorator for FlexLock with progressive framework support."""
 
 import sys
-import os
 import functools
 from loguru import logger
 import inspect
 from typing import Dict, Optional
 from .runner import FlexLockRunner
 from .utils import py2cfg, instantiate
-from .debug import debug_on_fail
+from .debug import debug_on_fail, _debug_enabled
 from .snapshot import snapshot
 
 
@@ -56,26 +55,30 @@ def _should_use_cli_mode():
     - train() in Jupyter → Don't parse ✗
     - ipykernel_launcher.py --f=kernel.json → Don't parse ✗
     """
-    if len(sys.argv) == 0:
+    # sys.argv rarely changes within a process: decide once per argv value
+    return _cli_mode_for_argv(tuple(sys.argv))
+
+
+@functools.lru_cache(maxsize=8)
+def _cli_mode_for_argv(argv: tuple) -> bool:
+    """Implementation of :func:`_should_use_cli_mode` for a given ``argv``."""
+    if len(argv) == 0:
         # No arguments, likely interactive
         logger.debug("No sys.argv detected, assuming interactive mode")
         return False
 
     # Check sys.argv[0] for kernel launcher
-    if sys.argv[0].endswith("ipykernel_launcher.py"):
+    if argv[0].endswith("ipykernel_launcher.py"):
         logger.debug(
             f"Detected ipykernel_launcher in sys.argv[0], skipping CLI parsing"
         )
         return False
 
     # Check for kernel connection file arguments
-    for arg in sys.argv[1:]:
+    for i, arg in enumerate(argv[1:], start=1):
         if "--f=" in arg or arg.startswith("-f"):
             # Check if next arg or same arg contains .json (connection file)
-            if ".json" in arg or (
-                sys.argv.index(arg) + 1 < len(sys.argv)
-                and ".json" in sys.argv[sys.argv.index(arg) + 1]
-            ):
+            if ".json" in arg or (i + 1 < len(argv) and ".json" in argv[i + 1]):
                 logger.debug(f"Detected Jupyter kernel connection file argument: {arg}")
                 return False
 
@@ -83,7 +86,7 @@ def _should_use_cli_mode():
     # - Normal script execution
     # - %run command (sys.argv[0] is script name, args look normal)
     # Both should parse CLI
-    logger.debug(f"CLI mode enabled. sys.argv: {sys.argv}")
+    logger.debug(f"CLI mode enabled. sys.argv: {list(argv)}")
     return True
 
 
@@ -120,7 +123,7 @@ def flexcli(_func=None, snapshot_config: Optional[Dict] = None, **defaults):
             if len(args) > 0 or len(kwargs) > 0:
                 # Direct call with arguments - execute immediately
                 # Apply debug wrapper if enabled
-                if os.environ.get("FLEXLOCK_DEBUG", "false").lower() in ("1", "true"):
+                if _debug_enabled():
                     return debug_on_fail(fn)(*args, **kwargs)
                 else:
                     return fn(*args, **kwargs)
@@ -146,7 +149,7 @@ def flexcli(_func=None, snapshot_config: Optional[Dict] = None, **defaults):
                 )
 
                 # Execute with debug wrapper if enabled
-                if os.environ.get("FLEXLOCK_DEBUG", "false").lower() in ("1", "true"):
+                if _debug_enabled():
                     return debug_on_fail(fn)(**defaults)
                 else:
                     return fn(**defaults)
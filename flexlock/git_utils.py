@@ -1,17 +1,43 @@
 """Source code versioning utilities for FlexLock."""
 
-import fnmatch
 import os
 import shutil
+import threading
 import uuid
 import warnings
 from pathlib import Path
 from contextlib import contextmanager
-from git.repo import Repo as GitRepo
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from git.repo import Repo as GitRepo
+
+# Per-thread cache of opened repositories (GitPython objects are not thread-safe)
+_thread_local_repos = threading.local()
+
+
+def _repo_for(path) -> "GitRepo":
+    """
+    Returns a GitRepo for ``path``, reusing the one opened earlier in this thread.
+
+    Opening a repository walks parent directories and parses the git config;
+    the cached instance is dropped if its git directory has disappeared.
+    """
+    key = os.path.realpath(path)
+    if not hasattr(_thread_local_repos, "repos"):
+        _thread_local_repos.repos = {}
+    repo = _thread_local_repos.repos.get(key)
+    if repo is None or not os.path.isdir(repo.git_dir):
+        # GitPython is imported lazily: it is only needed once a repo is tracked
+        from git.repo import Repo as GitRepo
+
+        repo = GitRepo(key, search_parent_directories=True)
+        _thread_local_repos.repos[key] = repo
+    return repo
 
 
 @contextmanager
-def shadow_index(repo: GitRepo):
+def shadow_index(repo: "GitRepo"):
     """Context manager for Git Plumbing operations without touching user index."""
     git_dir = Path(repo.git_dir)
     temp_index = git_dir / f"index_shadow_{uuid.uuid4().hex}"
@@ -50,7 +76,7 @@ def create_shadow_snapshot(
     Creates a Shadow Commit.
     Returns: {commit_hash, tree_hash, is_dirty}
     """
-    repo = GitRepo(repo_path, search_parent_directories=True)
+    repo = _repo_for(repo_path)
     ignore_patterns = ignore_patterns or []
 
     with shadow_index(repo) as shadow_env:
@@ -89,10 +115,24 @@ def create_shadow_snapshot(
         return {
             "commit": shadow_commit,
             "tree": tree_hash,  # <--- The key for Equality Checks
-            "is_dirty": repo.is_dirty(untracked_files=True),
+            "is_dirty": _is_dirty(repo),
         }
 
 
+def _is_dirty(repo: "GitRepo") -> bool:
+    """
+    Equivalent of ``repo.is_dirty(untracked_files=True)`` in a single git call.
+
+    GitPython runs two diffs plus an untracked-files listing; one porcelain
+    status covers staged, unstaged and untracked changes at once. Optional
+    locks are disabled so that the user's index is never rewritten.
+    """
+    env = {**os.environ, "GIT_OPTIONAL_LOCKS": "0"}
+    return bool(
+        repo.git.status("--porcelain", "--untracked-files=normal", env=env).strip()
+    )
+
+
 def get_git_tree_hash(path: str = ".") -> str:
     """
     Gets the current git tree hash for a repository without creating a new commit.
@@ -105,7 +145,7 @@ def get_git_tree_hash(path: str = ".") -> str:
         str: The tree hash, or an error message if it fails.
     """
     try:
-        repo = GitRepo(path, search_parent_directories=True)
+        repo = _repo_for(path)
         # Get the tree hash of the current commit
         return repo.head.commit.tree.hexsha
     except Exception as e:
@@ -123,7 +163,7 @@ def get_git_commit(path: str = ".") -> str:
         str: The commit hash, or an error message if it fails.
     """
     try:
-        repo = GitRepo(path, search_parent_directories=True)
+        repo = _repo_for(path)
         return repo.head.commit.hexsha
     except Exception as e:
         return f"Error getting git commit: {e}"
@@ -1,8 +1,71 @@
 """Utility for loading data from a previous FlexLock stage."""
 
+import copy
+import os
+import threading
 from pathlib import Path
 import yaml
 
+from .utils import YamlLoader
+
+# Parsed run.lock files, keyed by absolute path and validated against
+# (mtime_ns, size)
+_RUN_LOCK_CACHE: dict[str, tuple[int, int, dict]] = {}
+_RUN_LOCK_CACHE_SIZE = 256
+_run_lock_cache_lock = threading.Lock()
+
+
+def _cache_run_lock(key: str, st: os.stat_result, data: dict) -> None:
+    """Stores a parsed run.lock, evicting the oldest entry if the cache is full."""
+    with _run_lock_cache_lock:
+        _RUN_LOCK_CACHE.pop(key, None)
+        if len(_RUN_LOCK_CACHE) >= _RUN_LOCK_CACHE_SIZE:
+            _RUN_LOCK_CACHE.pop(next(iter(_RUN_LOCK_CACHE)))
+        _RUN_LOCK_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+
+
+def load_run_lock(lock_file) -> dict:
+    """
+    Loads a run.lock file, reusing the previous parse if the file is unchanged.
+
+    The cache entry is validated with a single stat (mtime and size), so a file
+    rewritten in place is re-parsed. A deep copy is returned so that callers may
+    freely mutate the result.
+
+    Args:
+        lock_file: Path to the run.lock file.
+
+    Returns:
+        dict: The parsed content of the file.
+    """
+    key = os.path.abspath(lock_file)
+    st = os.stat(key)
+    cached = _RUN_LOCK_CACHE.get(key)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return copy.deepcopy(cached[2])
+
+    with open(key, "r") as f:
+        data = yaml.load(f, Loader=YamlLoader)
+    _cache_run_lock(key, st, data)
+    return copy.deepcopy(data)
+
+
+def remember_run_lock(lock_file, data: dict) -> None:
+    """
+    Seeds the run.lock cache with data that was just written to lock_file.
+
+    Readers in the same process (e.g. mlflow_context logging the run right
+    after it was saved) then skip reading the file again.
+
+    Args:
+        lock_file: Path to the freshly written run.lock file.
+        data: The data dumped to the file, holding only plain YAML types so
+            that readers see what a fresh load would. It is copied, so the
+            caller may keep mutating its own dict.
+    """
+    key = os.path.abspath(lock_file)
+    _cache_run_lock(key, os.stat(key), copy.deepcopy(data))
+
 
 def load_stage_from_path(path: str) -> dict:
     """
@@ -39,8 +102,7 @@ def _load_and_flatten_recursively(
             f"run.lock not found in previous stage '{stage_key}': {lock_file}"
         )
 
-    with open(lock_file, "r") as f:
-        stage_data = yaml.safe_load(f)
+    stage_data = load_run_lock(lock_file)
 
     # Recurse into nested stages first (depth-first)
     # Support both "lineage" (new) and "prevs" (legacy)
@@ -5,21 +5,59 @@ from pathlib import Path
 from typing import Dict, Optional, Any
 from contextlib import contextmanager
 from loguru import logger
-from omegaconf import OmegaConf
+
+from .load_stage import load_run_lock
+
+# MLflow rejects batches with more than 100 params
+_MAX_PARAMS_PER_BATCH = 100
+
+# Latest run started by this process for each logical directory, checked
+# with a direct get_run before falling back to a search over the experiment
+_LAST_RUN_IDS: Dict[str, str] = {}
 
 
 def _flatten_dict(
-    d: Dict[str, Any], parent_key: str = "", sep: str = "."
+    d: Dict[str, Any],
+    parent_key: str = "",
+    sep: str = ".",
+    out: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """Flatten a nested dictionary into a single-level dict with dot-separated keys."""
-    items = []
+    if out is None:
+        out = {}
     for k, v in d.items():
         new_key = f"{parent_key}{sep}{k}" if parent_key else k
         if isinstance(v, dict):
-            items.extend(_flatten_dict(v, new_key, sep=sep).items())
+            _flatten_dict(v, new_key, sep, out)
         else:
-            items.append((new_key, v))
-    return dict(items)
+            out[new_key] = v
+    return out
+
+
+def _find_active_run(client, experiment_id: str, logical_id: str):
+    """Return the active run pointing to ``logical_id``, or None."""
+    known_id = _LAST_RUN_IDS.get(logical_id)
+    if known_id is not None:
+        try:
+            run = client.get_run(known_id)
+        except Exception:
+            run = None
+        if (
+            run is not None
+            and run.info.experiment_id == experiment_id
+            and run.data.tags.get("flexlock.dir") == logical_id
+            and run.data.tags.get("flexlock.status") == "active"
+        ):
+            return run
+
+    filter_str = f"tags.`flexlock.dir` = '{logical_id}' AND tags.`flexlock.status` = 'active'"
+    runs = client.search_runs(
+        experiment_ids=[experiment_id],
+        filter_string=filter_str,
+        max_results=1,
+        order_by=["start_time DESC"],
+    )
+    return runs[0] if runs else None
 
 
 @contextmanager
@@ -73,6 +111,7 @@ def mlflow_context(
     """
     try:
         import mlflow
+        from mlflow.entities import Param, RunTag
         from mlflow.tracking import MlflowClient
     except ImportError:
         logger.warning(
@@ -94,17 +133,11 @@ def mlflow_context(
     prev_run_id = None
     prev_run_tags = {}
     try:
-        filter_str = f"tags.`flexlock.dir` = '{logical_id}' AND tags.`flexlock.status` = 'active'"
-        runs = client.search_runs(
-            experiment_ids=[exp.experiment_id],
-            filter_string=filter_str,
-            max_results=1,
-            order_by=["start_time DESC"],
-        )
-        if runs:
-            prev_run_id = runs[0].info.run_id
-            # Get the previous run's tags to inherit user tags (like pipeline tags)
-            prev_run = client.get_run(prev_run_id)
+        prev_run = _find_active_run(client, exp.experiment_id, logical_id)
+        if prev_run is not None:
+            prev_run_id = prev_run.info.run_id
+            # Inherit user tags (like pipeline tags): search_runs already
+            # returns the full run data, no need for a get_run round-trip
             prev_run_tags = {
                 k: v
                 for k, v in prev_run.data.tags.items()
@@ -136,32 +169,48 @@ def mlflow_context(
         inherited_and_current_tags = {**prev_run_tags, **(tags or {})}
         default_tags.update(inherited_and_current_tags)
 
-        mlflow.set_tags(default_tags)
-
         # 4. INHERIT STATE (Pull forward artifacts from disk)
         # This solves the "Empty Run" problem. Even if this is just a plotting script,
         # we log the run.lock and logs from the folder so this run looks complete.
-        if log_config:
-            lock_path = save_dir / "run.lock"
-            if lock_path.exists():
-                try:
-                    # Log Config Params
-                    cfg_obj = OmegaConf.load(lock_path)
-                    content = cfg_obj.get("config", cfg_obj)  # Handle nested or flat
-                    flat_params = _flatten_dict(
-                        OmegaConf.to_container(content, resolve=True)
-                    )
+        lock_path = save_dir / "run.lock"
+        params = []
+        if log_config and lock_path.exists():
+            try:
+                # Read Config Params: run.lock holds the already-resolved config,
+                # so the plain parsed dict is flattened directly
+                lock_data = load_run_lock(lock_path)
+                content = lock_data.get("config", lock_data)  # Handle nested or flat
+                flat_params = _flatten_dict(content)
+
+                # Sanitize (truncate long strings to avoid MLflow param length limits)
+                params = [Param(k, str(v)[:250]) for k, v in flat_params.items()]
+            except Exception as e:
+                logger.warning(f"MLflow config logging warning: {e}")
 
-                    # Sanitize (truncate long strings to avoid MLflow param length limits)
-                    clean_params = {k: str(v)[:250] for k, v in flat_params.items()}
-                    mlflow.log_params(clean_params)
-                    logger.info(f"Logged parameters from {lock_path}")
+        # Tags first and on their own: a param the server rejects must not
+        # leave the run without the flexlock.* tags that identify it
+        client.log_batch(
+            run_id, tags=[RunTag(k, str(v)) for k, v in default_tags.items()]
+        )
+        _LAST_RUN_IDS[logical_id] = run_id
+        if params:
+            try:
+                # Params in as few requests as the server allows
+                for start in range(0, len(params), _MAX_PARAMS_PER_BATCH):
+                    client.log_batch(
+                        run_id, params=params[start : start + _MAX_PARAMS_PER_BATCH]
+                    )
+                logger.info(f"Logged parameters from {lock_path}")
+            except Exception as e:
+                logger.warning(f"MLflow config logging warning: {e}")
 
-                    # Log the lock file itself
-                    mlflow.log_artifact(str(lock_path))
-                    logger.info(f"Logged artifact: {lock_path}")
-                except Exception as e:
-                    logger.warning(f"MLflow config logging warning: {e}")
+        if log_config and lock_path.exists():
+            try:
+                # Log the lock file itself
+                mlflow.log_artifact(str(lock_path))
+                logger.info(f"Logged artifact: {lock_path}")
+            except Exception as e:
+                logger.warning(f"MLflow config logging warning: {e}")
 
         if log_artifacts:
             # Auto-log standard files if they exist on disk
@@ -185,8 +234,14 @@ def mlflow_context(
         # Only do this if the new run finished successfully (reached this block)
         if prev_run_id:
             try:
-                client.set_tag(prev_run_id, "flexlock.status", "deprecated")
-                client.set_tag(prev_run_id, "flexlock.superseded_by", run_id)
+                # Both tags in a single request
+                client.log_batch(
+                    prev_run_id,
+                    tags=[
+                        RunTag("flexlock.status", "deprecated"),
+                        RunTag("flexlock.superseded_by", run_id),
+                    ],
+                )
                 logger.info(f"Superseded previous MLflow run {prev_run_id}")
             except Exception as e:
                 logger.warning(f"Failed to deprecate run {prev_run_id}: {e}")
@@ -12,7 +12,7 @@ from multiprocessing import Process
 import yaml
 from typing import Any, List
 from flexlock.snapshot import snapshot
-from flexlock.utils import extract_tracking_info
+from flexlock.utils import extract_tracking_info, YamlLoader
 from flexlock import config
 
 
@@ -30,7 +30,7 @@ def load_tasks(tasks: str, tasks_key: str, cfg: DictConfig) -> List[Any]:
                 )
             elif p_tasks.suffix in [".yaml", ".yml"]:
                 with p_tasks.open() as f:
-                    all_tasks.extend(yaml.safe_load(f))
+                    all_tasks.extend(yaml.load(f, Loader=YamlLoader))
             else:
                 raise ValueError(f"Unsupported tasks file format: {p_tasks.suffix}")
         return all_tasks
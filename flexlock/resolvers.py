@@ -4,6 +4,7 @@ from omegaconf import OmegaConf, DictConfig
 from .data_hash import hash_data
 from .load_stage import load_stage_from_path
 from datetime import datetime
+import os
 import re
 from pathlib import Path
 from functools import wraps
@@ -65,8 +66,10 @@ def vinc_resolver(path: str, fmt: str = "_{i:04d}") -> str:
     highest_version = -1
     if not parent_dir.exists():
         parent_dir.mkdir(parents=True, exist_ok=True)
-    for item in parent_dir.glob(f"{base_name}*"):
-        match = regex.match(item.name)
+    # Match entry names directly: no Path objects, and no glob pattern that
+    # would misread brackets or stars in base_name
+    for name in os.listdir(parent_dir):
+        match = regex.match(name)
         if match:
             version = int(match.group(1))
             if version > highest_version:
@@ -81,7 +84,11 @@ def vinc_resolver(path: str, fmt: str = "_{i:04d}") -> str:
 def register_resolvers():
     """
     Registers the flexlock resolvers with OmegaConf.
+
+    The resolvers are not cached: OmegaConf keeps the cache on the root config
+    and copies it on merge, so task configs built from a resolved base would
+    all reuse its version directory or timestamp.
     """
-    OmegaConf.register_new_resolver("now", now_resolver)
-    OmegaConf.register_new_resolver("vinc", vinc_resolver)
-    OmegaConf.register_new_resolver("latest", latest_resolver)
+    OmegaConf.register_new_resolver("now", now_resolver, replace=True)
+    OmegaConf.register_new_resolver("vinc", vinc_resolver, replace=True)
+    OmegaConf.register_new_resolver("latest", latest_resolver, replace=True)
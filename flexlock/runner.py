@@ -4,13 +4,18 @@ import argparse
 import json
 import csv
 import yaml
-import os
 from pathlib import Path
 from typing import List, Any, Dict
 from omegaconf import OmegaConf, open_dict, ListConfig, DictConfig
 from datetime import datetime
-from .utils import load_python_defaults, instantiate, py2cfg, extract_tracking_info
-from .debug import debug_on_fail
+from .utils import (
+    load_python_defaults,
+    instantiate,
+    py2cfg,
+    extract_tracking_info,
+    YamlLoader,
+)
+from .debug import debug_on_fail, _debug_enabled
 from .parallel import ParallelExecutor
 from .snapshot import snapshot
 from .diff import RunDiff
@@ -163,7 +168,7 @@ class FlexLockRunner:
             cfg.merge_with(OmegaConf.from_dotlist(args.overrides))
 
         if args.debug:
-            logger.debug(f"Final Root Config: {cfg}")
+            logger.debug("Final Root Config: {}", cfg)
         return cfg
 
     def _parse_cli_sweep(self, sweep_str: str) -> List[Any]:
@@ -207,7 +212,7 @@ class FlexLockRunner:
                 # Try to cast to int/float/bool, fallback to string
                 try:
                     # YAML safe load handles typing (1 -> int, 1.0 -> float, true -> bool)
-                    val = yaml.safe_load(item)
+                    val = yaml.load(item, Loader=YamlLoader)
                     parsed_items.append(val)
                 except Exception:
                     parsed_items.append(item)
@@ -265,7 +270,7 @@ class FlexLockRunner:
                     # strip whitespace and skip empty lines
                     raw_tasks = [line.strip() for line in f if line.strip()]
                     # Attempt type conversion via YAML
-                    raw_tasks = [yaml.safe_load(t) for t in raw_tasks]
+                    raw_tasks = [yaml.load(t, Loader=YamlLoader) for t in raw_tasks]
 
         elif args.sweep:
             raw_tasks = self._parse_cli_sweep(args.sweep)
@@ -312,7 +317,7 @@ class FlexLockRunner:
 
         # Load existing run data
         with open(lock_file, "r") as f:
-            existing_data = yaml.safe_load(f)
+            existing_data = yaml.load(f, Loader=YamlLoader)
 
         # Compare with current configuration
         diff = RunDiff(cfg, existing_data)
@@ -323,12 +328,12 @@ class FlexLockRunner:
         run_func = instantiate
 
         root_cfg = self.load_config(args)
-        logger.info(f"Loaded root config: {root_cfg}")
+        logger.info("Loaded root config: {}", root_cfg)
         # Select Node
         node_cfg = root_cfg
         if args.select:
             node_cfg = OmegaConf.select(root_cfg, args.select)
-            logger.debug(f"Loaded node config: {node_cfg}")
+            logger.debug("Loaded node config: {}", node_cfg)
 
             if node_cfg is None:
                 raise FlexLockValidationError(
@@ -361,10 +366,7 @@ class FlexLockRunner:
         node_cfg = self._prepare_node(node_cfg)
 
         # ACTIVATE DEBUGGING GLOBALLY
-        debug = args.debug or os.environ.get("FLEXLOCK_DEBUG", "false").lower() in (
-            "1",
-            "true",
-        )
+        debug = args.debug or _debug_enabled()
         if debug:
             logger.info("Debug mode enabled")
             run_func = debug_on_fail(run_func)
@@ -376,7 +378,8 @@ class FlexLockRunner:
         if tasks:
             if debug:
                 logger.info(
-                    f"Running sweep with {len(tasks)} tasks in debug mode one job, no hpc."
+                    "Running sweep with {} tasks in debug mode one job, no hpc.",
+                    len(tasks),
                 )
                 # Batch execution
                 executor = ParallelExecutor(
@@ -388,7 +391,7 @@ class FlexLockRunner:
                 )
                 return executor.run()
             else:
-                logger.info(f"Running sweep with {len(tasks)} tasks.")
+                logger.info("Running sweep with {} tasks.", len(tasks))
                 # Batch execution
                 executor = ParallelExecutor(
                     func=run_func,
@@ -2,16 +2,63 @@
 
 import tempfile
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
+from enum import Enum
+from pathlib import Path, PurePath
+import yaml
 from omegaconf import OmegaConf
 from .git_utils import create_shadow_snapshot
 from .data_hash import hash_data
-from .load_stage import load_stage_from_path
+from .load_stage import load_run_lock, load_stage_from_path, remember_run_lock
+from .utils import YamlDumper
 from loguru import logger
 import uuid
 
 
+# Long-lived pool for data hashing: its threads keep their SQLite connections
+# to the hash cache (see data_hash._get_db) from one snapshot to the next.
+_HASH_POOL = None
+_HASH_POOL_WORKERS = 16
+_hash_pool_lock = threading.Lock()
+
+
+def _hash_pool() -> ThreadPoolExecutor:
+    """Returns the shared data hashing pool, creating it on first use."""
+    global _HASH_POOL
+    with _hash_pool_lock:
+        if _HASH_POOL is None:
+            _HASH_POOL = ThreadPoolExecutor(
+                max_workers=_HASH_POOL_WORKERS, thread_name_prefix="flexlock-hash"
+            )
+        return _HASH_POOL
+
+
+def _reset_hash_pool():
+    """Drops the parent's pool in a forked child, whose copy has no threads."""
+    global _HASH_POOL, _hash_pool_lock
+    _HASH_POOL = None
+    _hash_pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_hash_pool)
+
+
+def _plain(value):
+    """Replaces Path and Enum values, at any depth, by the strings run.lock holds."""
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    if isinstance(value, PurePath):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+
 class RunTracker:
     def __init__(self, save_dir, parent_lock=None):
         self.save_dir = Path(save_dir)
@@ -29,25 +76,39 @@ class RunTracker:
         if self.parent_lock:
             return
 
-        self.data["repos"] = {}
-        for name, repo_info in repos.items():
-            path = repo_info["path"]
-            snapshot_data = create_shadow_snapshot(
-                path,
-                ref_name=str(self.save_dir) + f"_{uuid.uuid1().hex}",
-            )
-            # Store metadata for comparison-time filtering
-            if repo_info.get("include"):
-                snapshot_data["include"] = repo_info["include"]
-            if repo_info.get("exclude"):
-                snapshot_data["exclude"] = repo_info["exclude"]
-            if repo_info.get("module"):
-                snapshot_data["module"] = repo_info["module"]
-            snapshot_data["path"] = path
-            self.data["repos"][name] = snapshot_data
+        names = list(repos)
+        if len(names) > 1:
+            # Git work is subprocess-bound: snapshot the repositories concurrently
+            with ThreadPoolExecutor(max_workers=min(8, len(names))) as pool:
+                snapshots = list(pool.map(self._snapshot_repo, repos.values()))
+        else:
+            snapshots = [self._snapshot_repo(info) for info in repos.values()]
+        self.data["repos"] = dict(zip(names, snapshots))
+
+    def _snapshot_repo(self, repo_info: dict) -> dict:
+        """Create the shadow snapshot of one tracked repository."""
+        path = repo_info["path"]
+        snapshot_data = create_shadow_snapshot(
+            path,
+            ref_name=str(self.save_dir) + f"_{uuid.uuid1().hex}",
+        )
+        # Store metadata for comparison-time filtering
+        if repo_info.get("include"):
+            snapshot_data["include"] = repo_info["include"]
+        if repo_info.get("exclude"):
+            snapshot_data["exclude"] = repo_info["exclude"]
+        if repo_info.get("module"):
+            snapshot_data["module"] = repo_info["module"]
+        snapshot_data["path"] = path
+        return snapshot_data
 
     def record_data(self, data_paths: dict):
-        self.data["data"] = {k: hash_data(v) for k, v in data_paths.items()}
+        if len(data_paths) > 1:
+            # Hashing is I/O bound: read the inputs concurrently
+            hashes = list(_hash_pool().map(hash_data, data_paths.values()))
+        else:
+            hashes = [hash_data(v) for v in data_paths.values()]
+        self.data["data"] = dict(zip(data_paths, hashes))
 
     def add_lineage(self, name: str, path: str, info: dict):
         """Add lineage information from upstream FlexLock runs."""
@@ -69,7 +130,11 @@ class RunTracker:
         Returns:
             dict: Complete snapshot data structure
         """
-        self.data["config"] = OmegaConf.to_container(config, resolve=True)
+        self.data["config"] = OmegaConf.to_container(
+            config, resolve=True, enum_to_str=True
+        )
+        # Plain YAML types only, so the dict equals what parsing run.lock yields
+        self.data = _plain(self.data)
         return self.data
 
     def save(self, config):
@@ -81,13 +146,19 @@ class RunTracker:
             dict: The snapshot data that was written
         """
         snapshot_data = self.finalize(config)
+        content = yaml.dump(
+            snapshot_data, Dumper=YamlDumper, sort_keys=False, allow_unicode=True
+        )
 
         # Atomic Write
         self.save_dir.mkdir(parents=True, exist_ok=True)
         with tempfile.NamedTemporaryFile("w", dir=self.save_dir, delete=False) as tf:
-            tf.write(OmegaConf.to_yaml(snapshot_data))
+            tf.write(content)
             tmp_name = tf.name
-        os.replace(tmp_name, self.save_dir / "run.lock")
+        lock_file = self.save_dir / "run.lock"
+        os.replace(tmp_name, lock_file)
+        # finalize() left only plain types: the data equals a parse of the file
+        remember_run_lock(lock_file, snapshot_data)
 
         return snapshot_data
 
@@ -153,9 +224,7 @@ def snapshot(
             lock_file = p / "run.lock"
             if lock_file.exists():
                 try:
-                    data = OmegaConf.to_container(
-                        OmegaConf.load(lock_file), resolve=True
-                    )
+                    data = load_run_lock(lock_file)
                     logger.debug(f"Found snapshot at: {p}")
                     return (p, data)
                 except Exception as e:
@@ -163,9 +232,13 @@ def snapshot(
 
             return None
 
-        for path_str in prevs:
-            result = _find_snapshot_dir(path_str)
+        if len(prevs) > 1:
+            with ThreadPoolExecutor(max_workers=min(16, len(prevs))) as pool:
+                found = list(pool.map(_find_snapshot_dir, prevs))
+        else:
+            found = [_find_snapshot_dir(path_str) for path_str in prevs]
 
+        for result in found:
             if result:
                 snapshot_dir, snapshot_data = result
                 # We found an upstream FlexLock run!
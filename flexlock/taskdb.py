@@ -1,5 +1,6 @@
 """SQLite-based task database for FlexLock parallel execution."""
 
+import os
 from pathlib import Path
 import sqlite3
 from omegaconf import OmegaConf
@@ -9,6 +10,7 @@ import yaml
 import hashlib
 import logging
 from contextlib import contextmanager
+from dataclasses import dataclass
 from typing import Any, List
 
 logger = logging.getLogger(__name__)
@@ -20,6 +22,14 @@ def _hash_task(task: Any) -> str:
     return hashlib.sha1(str(task).encode()).hexdigest()
 
 
+@dataclass(slots=True, frozen=True)
+class TaskEnvelope:
+    """A claimed task: its database id and its parsed config."""
+
+    task_id: str
+    task: Any
+
+
 @contextmanager
 def _conn(db_path: Path):
     """
@@ -30,8 +40,9 @@ def _conn(db_path: Path):
     with the same path within that thread.
     """
     # Use the absolute path as a reliable key for the connections dictionary.
-    db_path_str = str(db_path.resolve())
-    db_path.parent.mkdir(parents=True, exist_ok=True)
+    # abspath is string-only: claim/finish calls pay no syscalls to find
+    # their cached connection.
+    db_path_str = os.path.abspath(db_path)
 
     # Initialize the connections dictionary for the current thread if it doesn't exist.
     if not hasattr(_thread_local_conns, "conns"):
@@ -40,6 +51,7 @@ def _conn(db_path: Path):
     # Check if a connection for this specific db_path already exists in the thread's cache.
     if db_path_str not in _thread_local_conns.conns:
         # If not, create a new connection and add it to the cache.
+        db_path.parent.mkdir(parents=True, exist_ok=True)
         try:
             c = sqlite3.connect(db_path_str, check_same_thread=False)
             # Set PRAGMA for better performance and concurrency.
@@ -98,29 +110,37 @@ def queue_tasks(db_path: Path, tasks: List[Any]) -> None:
         c.commit()
 
 
-def claim_next_task(db_path: Path, node: str) -> Any | None:
+def claim_next_task(db_path: Path, node: str) -> TaskEnvelope | None:
     """Claims the next available pending task from the database and marks it as running."""
     with _conn(db_path) as c:
         cur = c.execute(
             """
             UPDATE tasks SET status='running', node=?, ts_start=CURRENT_TIMESTAMP
             WHERE task_id = (SELECT task_id FROM tasks WHERE status='pending' LIMIT 1)
-            RETURNING task_info
+            RETURNING task_id, task_info
             """,
             (node,),
         )
         row = cur.fetchone()
         if row:
             c.commit()
-            return OmegaConf.create(row[0])
+            return TaskEnvelope(task_id=row[0], task=OmegaConf.create(row[1]))
     return None
 
 
 def finish_task(
-    db_path: Path, task: Any, error: str | None = None, result: Any | None = None
+    db_path: Path,
+    task: Any,
+    error: str | None = None,
+    result: Any | None = None,
+    task_id: str | None = None,
 ) -> None:
-    """Marks a task as finished (done or failed) and records its result or error."""
-    tid = _hash_task(task)
+    """Marks a task as finished (done or failed) and records its result or error.
+
+    ``task_id`` can be given (e.g. from a :class:`TaskEnvelope`) to avoid
+    re-hashing the task.
+    """
+    tid = task_id if task_id is not None else _hash_task(task)
     status = "failed" if error else "done"
     result_str = OmegaConf.to_yaml(result) if result is not None else None
     with _conn(db_path) as c:
@@ -325,7 +345,21 @@ def get_all_tasks(db_path: Path, status: str = None) -> list:
 def _atomic_write_yaml(data: list, path: Path):
     import tempfile, os
 
+    # Render once, then hand the whole buffer to the kernel
+    content = OmegaConf.to_yaml(data).encode("utf-8")
+
+    # Re-dumping an unchanged task table is common: skip the no-op write
+    try:
+        if path.read_bytes() == content:
+            return
+    except FileNotFoundError:
+        pass
+
+    buf = memoryview(content)
     fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.tmp-")
-    with os.fdopen(fd, "w") as f:
-        f.write(OmegaConf.to_yaml(data))
-    os.rename(tmp, path)
+    try:
+        while buf:
+            buf = buf[os.write(fd, buf) :]
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
@@ -1,9 +1,11 @@
 """Utility functions for FlexLock."""
 
+import copy
 import inspect
 import importlib
 import sys
 import functools
+import weakref
 from pathlib import Path
 from typing import Any, Tuple, Dict, List
 from omegaconf import OmegaConf, DictConfig, ListConfig, open_dict
@@ -11,7 +13,11 @@ from dataclasses import is_dataclass
 from contextlib import contextmanager
 from loguru import logger
 import warnings
-from dataclasses import fields
+import yaml
+
+# libyaml-backed (C) safe loader/dumper, with a pure-Python fallback
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 def collect_target_include_patterns(cfg, repo_path=None):
@@ -70,9 +76,9 @@ def resolve_module_to_repo_path(module_name: str) -> str:
     """Resolve a Python module name to its containing git repository's working directory."""
     mod = importlib.import_module(module_name)
     source_file = inspect.getfile(mod)
-    from git.repo import Repo as GitRepo
+    from .git_utils import _repo_for
 
-    repo_obj = GitRepo(source_file, search_parent_directories=True)
+    repo_obj = _repo_for(source_file)
     return repo_obj.working_tree_dir
 
 
@@ -230,12 +236,93 @@ def _find_run_dir(start_path: str) -> str | None:
     return None
 
 
+# Per-dataclass names of fields without a type hint; weak keys, see _CONVERTERS
+_MISSING_TYPE_HINTS: "weakref.WeakKeyDictionary[type, tuple]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _missing_type_hints(cls) -> tuple:
+    """Names of the dataclass fields of ``cls`` declared without a type hint."""
+    try:
+        return _MISSING_TYPE_HINTS[cls]
+    except KeyError:
+        pass
+    missing = tuple(n for n, f in cls.__dataclass_fields__.items() if f.type is None)
+    _MISSING_TYPE_HINTS[cls] = missing
+    return missing
+
+
+def _public_vars(obj) -> dict:
+    """Public, non-callable attributes stored in ``obj.__dict__``."""
+    return {
+        k: v for k, v in vars(obj).items() if not k.startswith("_") and not callable(v)
+    }
+
+
+def _slot_names(cls) -> Tuple[str, ...]:
+    """Public slot names declared by ``cls`` and its bases."""
+    names = {}
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if not name.startswith("_"):
+                names[name] = None
+    return tuple(names)
+
+
+# Per-type conversion function used by to_dictconfig for plain objects; weak
+# keys so classes created at runtime (e.g. in a notebook) can still be freed
+_CONVERTERS: "weakref.WeakKeyDictionary[type, Any]" = weakref.WeakKeyDictionary()
+
+
+def _converter_for(obj):
+    """Return (and cache per type) the function turning ``obj`` into a dict."""
+    cls = type(obj)
+    try:
+        return _CONVERTERS[cls]
+    except KeyError:
+        pass
+    if hasattr(obj, "__dict__"):
+        converter = _public_vars
+    elif hasattr(obj, "__slots__"):
+        slot_names = _slot_names(cls)
+
+        def converter(o):
+            return {name: getattr(o, name) for name in slot_names}
+
+    else:
+        converter = None
+    _CONVERTERS[cls] = converter
+    return converter
+
+
+@functools.lru_cache(maxsize=128)
+def _structured_for(cls):
+    """
+    Build the OmegaConf schema of a dataclass type once and reuse it.
+
+    The schema refers back to ``cls`` (its object_type), so a weak-keyed
+    mapping would never drop it: the cache is bounded instead, and at most
+    the 128 most recently used dataclass types are kept alive by it.
+    """
+    return OmegaConf.structured(cls)
+
+
 def to_dictconfig(incfg):
     """
     Convert various config formats (dataclass, dict, class instance, DictConfig)
     into a DictConfig object.
     Warns if dataclass fields are missing type annotations.
     """
+    # Fast paths: exact type checks for the most common inputs
+    incfg_type = type(incfg)
+    if incfg_type is DictConfig:
+        return incfg
+    if incfg_type is dict:
+        return OmegaConf.create(incfg)
 
     # Case 1: already DictConfig
     if isinstance(incfg, DictConfig):
@@ -243,35 +330,32 @@ def to_dictconfig(incfg):
 
     # Case 2: dataclass
     if is_dataclass(incfg):
-        # Find missing type hints
-        missing_types = [f.name for f in fields(incfg) if f.type is None]
+        # Find missing type hints (computed once per dataclass type)
+        cls = incfg if isinstance(incfg, type) else incfg_type
+        missing_types = _missing_type_hints(cls)
         if missing_types:
             warnings.warn(
-                f"Dataclass {type(incfg).__name__} has fields without type hints: "
+                f"Dataclass {cls.__name__} has fields without type hints: "
                 f"{', '.join(missing_types)}. "
                 "These fields will be ignored by OmegaConf.structured().",
                 UserWarning,
                 stacklevel=2,
             )
+        if cls is incfg:
+            # Dataclass types carry no instance state: reuse the schema from
+            # the bounded lru_cache of _structured_for, copied per call
+            return copy.deepcopy(_structured_for(incfg))
+        # Instances are introspected for their field values on every call
         return OmegaConf.structured(incfg)
 
     # Case 3: dict
     if isinstance(incfg, dict):
         return OmegaConf.create(incfg)
 
-    # Case 4: plain class instance
-    if hasattr(incfg, "__dict__"):
-        obj_dict = {
-            k: v
-            for k, v in vars(incfg).items()
-            if not k.startswith("_") and not callable(v)
-        }
-        return OmegaConf.create(obj_dict)
-
-    # Case 5: __slots__-based classes
-    if hasattr(incfg, "__slots__"):
-        obj_dict = {slot: getattr(incfg, slot) for slot in incfg.__slots__}
-        return OmegaConf.create(obj_dict)
+    # Case 4/5: plain class instance or __slots__-based class
+    converter = _converter_for(incfg)
+    if converter is not None:
+        return OmegaConf.create(converter(incfg))
 
     # Fallback: try creating directly
     return OmegaConf.create(incfg)
@@ -366,21 +450,33 @@ def load_python_defaults(import_path: str):
         return getattr(module, var_name)
 
 
-def merge_task_into_cfg(cfg: DictConfig, task: Any, task_to: str | None) -> DictConfig:
-    """Merge a task into the config."""
-    # Create a minimal config with just the task structure
+def split_task_to(task_to: str | None) -> Tuple[str, ...]:
+    """Split a ``task_to`` dot-path into its keys (empty for the config root)."""
+    if task_to is None or task_to == ".":
+        return ()
+    return tuple(task_to.split("."))
 
-    if (task_to is not None) and (task_to != "."):
-        task_branch = OmegaConf.create({})
-        OmegaConf.update(task_branch, task_to, task, force_add=True)
-        task = task_branch
+
+def merge_task_into_cfg(
+    cfg: DictConfig, task: Any, task_to: str | Tuple[str, ...] | None
+) -> DictConfig:
+    """Merge a task into the config.
+
+    ``task_to`` is either a dot-path or the keys returned by
+    :func:`split_task_to`, which lets callers parse the path only once.
+    """
+    keys = task_to if isinstance(task_to, tuple) else split_task_to(task_to)
+    # Create a minimal config with just the task structure
+    for key in reversed(keys):
+        task = {key: task}
+    # cfg is shared across tasks: merge into a copy rather than in place
     return OmegaConf.merge(cfg, task)
 
 
 @contextmanager
 def log_to_file(path):
-    # Add sink
-    lid = logger.add(path)
+    # Add sink; the file is only opened once a record is actually emitted
+    lid = logger.add(path, delay=True)
     try:
         yield
     finally:
@@ -397,9 +493,9 @@ def instantiate(config, *args, **kwargs):
         \*args, \*\*kwargs: Additional arguments to pass to the root object.
     """
     # 1. Base case: If config is not a dict or list, return it as is.
-    logger.debug(f"Instantiating config: {config} of type {type(config)}")
+    logger.debug("Instantiating config: {} of type {}", config, type(config))
     if not isinstance(config, (dict, list, DictConfig, ListConfig)):
-        logger.debug(f"Returning primitive config: {config}")
+        logger.debug("Returning primitive config: {}", config)
         return config
 
     if isinstance(config, (list, ListConfig)):
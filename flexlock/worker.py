@@ -5,10 +5,20 @@ import time
 from loguru import logger
 from multiprocessing import Process
 from .taskdb import claim_next_task, finish_task, pending_count
-from flexlock.utils import merge_task_into_cfg, instantiate, extract_tracking_info
+from flexlock.utils import (
+    merge_task_into_cfg,
+    instantiate,
+    extract_tracking_info,
+    split_task_to,
+)
 from flexlock.snapshot import snapshot
 from pathlib import Path
 from omegaconf import OmegaConf
+from flexlock import config
+
+# Initial idle back-off (seconds); doubled on every empty claim up to
+# config.WORKER_MAX_IDLE_SLEEP and reset as soon as a task is claimed.
+_MIN_IDLE_SLEEP = 0.1
 
 
 def worker_loop(func, cfg, task_to: str, db_path):
@@ -22,25 +32,27 @@ def worker_loop(func, cfg, task_to: str, db_path):
     db_dir = Path(db_path).parent
     master_lock = db_dir / "run.lock"
 
+    # Parse the task_to dot-path once for all tasks
+    task_keys = split_task_to(task_to)
+
+    idle_sleep = _MIN_IDLE_SLEEP
     while True:
-        task = claim_next_task(db_path, node)
-        if task is None:
+        claimed = claim_next_task(db_path, node)
+        if claimed is None:
             if pending_count(db_path) == 0:
                 logger.info("All tasks finished.")
                 break
-            logger.debug("No task available – sleeping 5s")
-            time.sleep(5)
+            logger.debug("No task available – sleeping {:.1f}s", idle_sleep)
+            time.sleep(idle_sleep)
+            idle_sleep = min(idle_sleep * 2, config.WORKER_MAX_IDLE_SLEEP)
             continue
+        idle_sleep = _MIN_IDLE_SLEEP
+        task, task_id = claimed.task, claimed.task_id
 
-        logger.info(f"Worker {node} running task {task}")
-
-        # Get task_id for DB operations
-        from flexlock.taskdb import _hash_task
-
-        task_id = _hash_task(task)
+        logger.info("Worker {} running task {}", node, task)
 
         try:
-            task_cfg = merge_task_into_cfg(cfg, task, task_to)
+            task_cfg = merge_task_into_cfg(cfg, task, task_keys)
 
             # 3. Resolve Data Dependencies (Just-in-Time)
             # We re-run resolution because task overrides might change data paths
@@ -67,7 +79,7 @@ def worker_loop(func, cfg, task_to: str, db_path):
                 from flexlock.taskdb import update_task_snapshot
 
                 update_task_snapshot(db_path, task_id, snapshot_data)
-                logger.debug(f"Stored snapshot for task {task_id} in database")
+                logger.debug("Stored snapshot for task {} in database", task_id)
 
             # Write marker file for lineage discovery
             import json
@@ -78,12 +90,12 @@ def worker_loop(func, cfg, task_to: str, db_path):
                 "task_id": task_id,
             }
             marker_file.write_text(json.dumps(marker_data, indent=2))
-            logger.debug(f"Wrote marker file at {marker_file}")
+            logger.debug("Wrote marker file at {}", marker_file)
 
             # 5. Execute
             result = func(task_cfg)
-            logger.info(f"Task successful: {task_cfg}")
-            finish_task(db_path, task, result=result)
+            logger.info("Task successful: {}", task_cfg)
+            finish_task(db_path, task, result=result, task_id=task_id)
         except Exception as e:
-            logger.error(f"Task failed: {e}", exc_info=True)
-            finish_task(db_path, task, error=str(e))
+            logger.error("Task failed: {}", e, exc_info=True)
+            finish_task(db_path, task, error=str(e), task_id=task_id)
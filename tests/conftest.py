@@ -0,0 +1,58 @@
+"""Shared pytest configuration for the FlexLock test suite."""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+from loguru import logger
+
+# The suite writes many small YAML, SQLite and git files under tmp_path;
+# keep them in memory when a tmpfs is available.
+_TMPFS = "/dev/shm"
+_TMPFS_MIN_FREE = 100 * 1024 * 1024
+
+# flexlock disables its logger on import: enable it once for the whole suite,
+# printing only warnings and errors so INFO messages are not formatted to stderr
+logger.enable("flexlock")
+logger.remove()
+logger.add(sys.stderr, level="WARNING")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Point pytest's basetemp at a fresh tmpfs directory unless one was given."""
+    if config.option.basetemp or hasattr(config, "workerinput"):
+        # Explicit --basetemp, or a pytest-xdist worker that inherits its own
+        return
+    if not (os.path.isdir(_TMPFS) and os.access(_TMPFS, os.W_OK)):
+        return
+    st = os.statvfs(_TMPFS)
+    if st.f_bavail * st.f_frsize < _TMPFS_MIN_FREE:
+        # A nearly full tmpfs would fail tests with ENOSPC; use the default
+        return
+    config.option.basetemp = tempfile.mkdtemp(prefix="flexlock-pytest-", dir=_TMPFS)
+    config._flexlock_tmpfs_basetemp = config.option.basetemp
+
+
+def pytest_unconfigure(config):
+    """Remove the tmpfs basetemp created in pytest_configure."""
+    basetemp = getattr(config, "_flexlock_tmpfs_basetemp", None)
+    if basetemp:
+        shutil.rmtree(basetemp, ignore_errors=True)
+
+
+@pytest.fixture
+def bump_mtime():
+    """Returns a helper that moves a file's mtime forward without sleeping.
+
+    ``bump_mtime(path)`` sets the mtime of ``path`` one second past its own,
+    ``bump_mtime(path, after=other)`` one second past ``other``'s.
+    """
+
+    def _bump(path, after=None):
+        ref_ns = os.stat(after if after is not None else path).st_mtime_ns
+        os.utime(path, ns=(ref_ns, ref_ns + 1_000_000_000))
+
+    return _bump
@@ -1,8 +1,10 @@
 import pytest
 from pathlib import Path
+import os
 import tempfile
 import shutil
 from flexlock.api import Project, ExecutionResult
+from flexlock.utils import YamlDumper, YamlLoader
 from omegaconf import OmegaConf, DictConfig
 
 
@@ -123,8 +125,7 @@ def test_project_exists():
         "repos": {"main": {"tree": "abc123"}},
         "data": {}
     }
-    with open(run_dir / "run.lock", 'w') as f:
-        yaml.dump(lock_data, f)
+    (run_dir / "run.lock").write_text(yaml.dump(lock_data, Dumper=YamlDumper))
 
     # Create a temporary defaults file
     with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
@@ -326,7 +327,7 @@ defaults = {
         import yaml
 
         with open(pipeline_file) as fh:
-            content = yaml.safe_load(fh)
+            content = yaml.load(fh, Loader=YamlLoader)
         assert "preprocess" in content
         assert "train" in content
         assert content["train"]["lr"] == 0.01
@@ -351,4 +352,30 @@ def test_save_snapshot_creates_dirs():
         assert (nested / "pipeline.yaml").exists()
     finally:
         Path(temp_file).unlink()
-        shutil.rmtree(temp_dir, ignore_errors=True)
\ No newline at end of file
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_save_snapshot_skips_unchanged_write():
+    """Test that save_snapshot does not rewrite an identical pipeline.yaml."""
+    temp_dir = tempfile.mkdtemp()
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
+        temp_file = f.name
+        f.write('defaults = {"a": 1}\n')
+
+    try:
+        project = Project(defaults=f"{temp_file}:defaults")
+        project.save_snapshot(temp_dir)
+        pipeline_file = Path(temp_dir) / "pipeline.yaml"
+        os.utime(pipeline_file, (0, 0))
+
+        project.save_snapshot(temp_dir)
+        assert pipeline_file.stat().st_mtime == 0
+
+        project.defaults.a = 2
+        project.save_snapshot(temp_dir)
+        assert pipeline_file.stat().st_mtime != 0
+        assert "a: 2" in pipeline_file.read_text()
+    finally:
+        Path(temp_file).unlink()
+        shutil.rmtree(temp_dir, ignore_errors=True)
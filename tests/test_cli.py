@@ -4,8 +4,7 @@ import pytest
 import yaml
 import shutil
 from pathlib import Path
-from unittest.mock import patch, MagicMock
-from git import Repo
+from unittest.mock import patch
 
 from flexlock.cli import (
     find_results_dirs,
@@ -18,26 +17,40 @@ from flexlock.cli import (
     main,
 )
 from flexlock.git_utils import sanitize_ref_name
+from flexlock.utils import YamlDumper
 
 
 # ── Fixtures ───────────────────────────────────────────────────
 
 
-@pytest.fixture
-def git_repo(tmp_path):
-    """Create a temporary git repository with an initial commit."""
-    repo_dir = tmp_path / "repo"
+@pytest.fixture(scope="session")
+def _base_git_repo(tmp_path_factory):
+    """Build the initial repository once; each test gets its own copy."""
+    from git import Repo
+
+    repo_dir = tmp_path_factory.mktemp("base") / "repo"
     repo_dir.mkdir()
     repo = Repo.init(repo_dir)
-    repo.config_writer().set_value("user", "name", "Test User").release()
-    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    with repo.config_writer() as writer:
+        writer.set_value("user", "name", "Test User")
+        writer.set_value("user", "email", "test@example.com")
 
     readme = repo_dir / "README.md"
     readme.write_text("init")
     repo.index.add([str(readme)])
     repo.index.commit("Initial commit")
 
-    return repo
+    return repo_dir
+
+
+@pytest.fixture
+def git_repo(tmp_path, _base_git_repo):
+    """Create a temporary git repository with an initial commit."""
+    from git import Repo
+
+    repo_dir = tmp_path / "repo"
+    shutil.copytree(_base_git_repo, repo_dir, symlinks=True)
+    return Repo(repo_dir)
 
 
 @pytest.fixture
@@ -53,7 +66,7 @@ def results_tree(tmp_path):
         }
         if lineage:
             data["lineage"] = lineage
-        (run_dir / "run.lock").write_text(yaml.dump(data))
+        (run_dir / "run.lock").write_text(yaml.dump(data, Dumper=YamlDumper))
         return str(run_dir)
 
     return _make_run
@@ -176,7 +189,7 @@ def test_tag_create(git_repo, tmp_path, capsys):
     (run_dir / "run.lock").write_text(yaml.dump({
         "timestamp": "2026-03-15T10:00:00",
         "config": {"save_dir": str(run_dir)},
-    }))
+    }, Dumper=YamlDumper))
 
     args = _make_args(name="baseline_v1", path=str(run_dir))
     cmd_tag(args)
@@ -233,7 +246,7 @@ def test_tag_with_message(git_repo, capsys):
     (run_dir / "run.lock").write_text(yaml.dump({
         "timestamp": "2026-03-15T10:00:00",
         "config": {"save_dir": str(run_dir)},
-    }))
+    }, Dumper=YamlDumper))
 
     args = _make_args(name="annotated", path=str(run_dir), message="Best run so far")
     cmd_tag(args)
@@ -266,7 +279,7 @@ def test_tag_links_lineage_parents(git_repo, capsys):
         "timestamp": "2026-03-15T09:00:00",
         "config": {"save_dir": str(upstream_dir)},
         "repos": {"main": {"commit": shadow_commit, "tree": tree_hash}},
-    }))
+    }, Dumper=YamlDumper))
 
     # Create downstream run referencing upstream
     downstream_dir = repo_dir / "results" / "downstream"
@@ -275,7 +288,7 @@ def test_tag_links_lineage_parents(git_repo, capsys):
         "timestamp": "2026-03-15T10:00:00",
         "config": {"save_dir": str(downstream_dir)},
         "lineage": {"upstream": {"path": str(upstream_dir)}},
-    }))
+    }, Dumper=YamlDumper))
 
     args = _make_args(name="full_pipeline", path=str(downstream_dir))
     cmd_tag(args)
@@ -300,7 +313,7 @@ def test_gc_dry_run(git_repo, capsys):
         (run_dir / "run.lock").write_text(yaml.dump({
             "timestamp": "2026-03-15T10:00:00",
             "config": {"save_dir": str(run_dir)},
-        }))
+        }, Dumper=YamlDumper))
 
     args = _make_args(path=str(repo_dir / "results"), dry_run=True)
     cmd_gc(args)
@@ -322,7 +335,7 @@ def test_gc_deletes_untagged(git_repo, capsys):
     (untagged / "run.lock").write_text(yaml.dump({
         "timestamp": "2026-03-15T10:00:00",
         "config": {"save_dir": str(untagged)},
-    }))
+    }, Dumper=YamlDumper))
 
     # Create a tagged run
     tagged = repo_dir / "results" / "tagged"
@@ -330,7 +343,7 @@ def test_gc_deletes_untagged(git_repo, capsys):
     (tagged / "run.lock").write_text(yaml.dump({
         "timestamp": "2026-03-15T11:00:00",
         "config": {"save_dir": str(tagged)},
-    }))
+    }, Dumper=YamlDumper))
 
     # Tag the second run
     tree_hash = git_repo.head.commit.tree.hexsha
@@ -358,7 +371,7 @@ def test_gc_protects_lineage(git_repo, capsys):
     (upstream / "run.lock").write_text(yaml.dump({
         "timestamp": "2026-03-15T09:00:00",
         "config": {"save_dir": str(upstream)},
-    }))
+    }, Dumper=YamlDumper))
 
     # downstream (tagged)
     downstream = repo_dir / "results" / "downstream"
@@ -367,7 +380,7 @@ def test_gc_protects_lineage(git_repo, capsys):
         "timestamp": "2026-03-15T10:00:00",
         "config": {"save_dir": str(downstream)},
         "lineage": {"upstream": {"path": str(upstream)}},
-    }))
+    }, Dumper=YamlDumper))
 
     # Tag downstream
     tree_hash = git_repo.head.commit.tree.hexsha
@@ -451,7 +464,7 @@ def test_collect_lineage_refs_from_repos(git_repo):
         "timestamp": "2026-01-01T00:00:00",
         "config": {"save_dir": str(run_dir)},
         "repos": {"main": {"commit": shadow_hash, "tree": "abc123"}},
-    }))
+    }, Dumper=YamlDumper))
 
     refs = collect_lineage_refs(git_repo, str(run_dir))
     assert shadow_hash in refs
@@ -1,13 +1,10 @@
 import pytest
 from pathlib import Path
-from omegaconf import OmegaConf
-from dataclasses import dataclass
-import time
 import os
-from unittest.mock import patch, call
+from unittest.mock import patch
 
+from flexlock import data_hash
 from flexlock.data_hash import hash_data, _get_db
-from flexlock.context import run_context
 
 # --- Fixtures ---
 
@@ -19,8 +16,10 @@ def clear_cache_before_each_test(tmp_path):
     Path(cache_dir).mkdir(parents=True, exist_ok=True)
     cache_file = cache_dir / "hashes.db"
 
-    # Mock the CACHE_DB path
-    with patch("flexlock.data_hash.CACHE_DB", cache_file):
+    # Mock the CACHE_DB path and start from an empty in-process memo
+    with patch("flexlock.data_hash.CACHE_DB", cache_file), patch.dict(
+        "flexlock.data_hash._FILE_HASH_MEMO", clear=True
+    ):
         if cache_file.exists():
             os.remove(cache_file)
         yield
@@ -50,6 +49,19 @@ def test_hash_data_file(test_data):
     assert isinstance(file_hash, str) and len(file_hash) == 16
 
 
+def test_hash_file_content_mmap_matches_streaming(tmp_path, monkeypatch):
+    """Memory-mapped hashing yields the same digest as a streamed xxh64."""
+    import xxhash
+
+    file_path = tmp_path / "blob.bin"
+    file_path.write_bytes(os.urandom(10000))
+    expected = xxhash.xxh64(file_path.read_bytes()).hexdigest()
+
+    assert data_hash._hash_file_content(file_path) == expected
+    monkeypatch.setattr(data_hash, "_MMAP_MIN_SIZE", 1024)
+    assert data_hash._hash_file_content(file_path) == expected
+
+
 def test_hash_data_directory(test_data):
     """Test hashing a directory and that it changes on modification."""
     dir_hash1 = hash_data(test_data)
@@ -60,6 +72,40 @@ def test_hash_data_directory(test_data):
     assert dir_hash1 != dir_hash2
 
 
+def test_dirhash_ignore_patterns(test_data):
+    """Test that ignored files do not contribute to the directory hash."""
+    from flexlock.data_hash import dirhash
+
+    base = dirhash(test_data, ignore=["*.log"])
+    (test_data / "sub" / "file2.log").write_text("changed")
+    assert dirhash(test_data, ignore=["*.log"]) == base
+    assert dirhash(test_data, ignore=["sub/*.log"]) == base
+    assert dirhash(test_data, ignore="other/*.log") != base
+
+    (test_data / "file1.txt").write_text("changed")
+    assert dirhash(test_data, ignore=["*.log"]) != base
+
+
+def test_dirhash_rejects_empty_ignore_pattern(test_data):
+    """An empty ignore pattern is an error rather than matching every file."""
+    from flexlock.data_hash import dirhash
+
+    for pattern in ("", "."):
+        with pytest.raises(ValueError, match="empty pattern"):
+            dirhash(test_data, ignore=[pattern])
+
+
+def test_dirhash_parallel_matches_serial(test_data):
+    """The directory digest does not depend on the number of hashing threads."""
+    from flexlock.data_hash import dirhash
+
+    for i in range(8):
+        (test_data / f"extra{i}.txt").write_text(str(i))
+    serial = dirhash(test_data, jobs=1)
+    assert dirhash(test_data, jobs=4) == serial
+    assert dirhash(test_data, jobs=-1) == serial
+
+
 # --- Caching Logic Tests ---
 
 
@@ -80,26 +126,103 @@ def test_hash_caching_file(test_data):
     assert hash1 == hash2
 
 
-def test_hash_caching_file_invalidation(test_data):
+def test_hash_file_memo_skips_rehash(test_data, monkeypatch):
+    """Repeated hashes of an unchanged file are served from the in-process memo."""
+    file_path = test_data / "file1.txt"
+    with patch(
+        "flexlock.data_hash._hash_file_content", wraps=data_hash._hash_file_content
+    ) as mock_hash:
+        hash1 = hash_data(file_path)
+        assert hash_data(file_path) == hash1
+        assert mock_hash.call_count == 1
+
+        file_path.write_text("hello, longer")
+        assert hash_data(file_path) != hash1
+        assert mock_hash.call_count == 2
+
+        monkeypatch.setenv("FLEXLOCK_NO_CACHE", "1")
+        hash_data(file_path)
+        assert mock_hash.call_count == 3
+
+
+def test_hash_cache_validates_size(test_data):
+    """A rewrite that keeps the mtime but changes the size is not served from cache."""
+    file_path = test_data / "file1.txt"
+    hash1 = hash_data(file_path)
+    st = file_path.stat()
+
+    file_path.write_text("hello, longer")
+    os.utime(file_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    data_hash._FILE_HASH_MEMO.clear()
+    assert hash_data(file_path) != hash1
+
+
+def test_cache_upsert_skips_identical_rows():
+    """Storing a row identical to the cached one does not rewrite it."""
+    row = ("/some/file", 1.5, None, None, "abcd", 0, 4, 1500000000)
+    with _get_db() as conn:
+        conn.execute(data_hash._UPSERT_CACHE_ROW, row)
+        assert conn.total_changes == 1
+        conn.execute(data_hash._UPSERT_CACHE_ROW, row)
+        assert conn.total_changes == 1
+        conn.execute(data_hash._UPSERT_CACHE_ROW, row[:4] + ("efgh",) + row[5:])
+        assert conn.total_changes == 2
+        assert conn.execute("SELECT hash FROM cache").fetchone()[0] == "efgh"
+        conn.commit()
+
+
+def test_cache_db_upgrades_old_schema(tmp_path):
+    """A cache created before the size/mtime_ns columns is upgraded in place."""
+    import sqlite3
+
+    old_db = tmp_path / "old.db"
+    conn = sqlite3.connect(old_db)
+    conn.execute(
+        "CREATE TABLE cache (path TEXT PRIMARY KEY, mtime REAL, file_count INTEGER,"
+        " latest_mtime REAL, hash TEXT, is_dir INTEGER)"
+    )
+    conn.close()
+
+    with patch("flexlock.data_hash.CACHE_DB", old_db):
+        with _get_db() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(cache)")}
+        file_path = tmp_path / "f.txt"
+        file_path.write_text("data")
+        assert hash_data(file_path) == hash_data(file_path)
+    assert {"size", "mtime_ns"} <= columns
+
+
+def test_hash_caching_file_invalidation(test_data, bump_mtime):
     """Verify that modifying a file invalidates the cache."""
     file_path = test_data / "file1.txt"
     hash1 = hash_data(file_path)
-    time.sleep(0.01)  # Ensure mtime is different
     file_path.write_text("new content")
+    bump_mtime(file_path)  # Ensure mtime is different
     hash2 = hash_data(file_path)
     assert hash1 != hash2
 
 
-def test_small_dir_cache_invalidation_by_content(test_data):
+def test_small_dir_cache_invalidation_by_content(test_data, bump_mtime):
     """Test that changing a file's content in a small dir invalidates the cache."""
     hash1 = hash_data(test_data)
-    time.sleep(0.01)
     # Modify a nested file. This should change the 'latest_mtime'.
     (test_data / "sub" / "file2.log").write_text("new world")
+    bump_mtime(test_data / "sub" / "file2.log")
     hash2 = hash_data(test_data)
     assert hash1 != hash2
 
 
+def test_dir_cache_miss_walks_tree_once(test_data):
+    """A directory cache miss reuses the stats from the lookup when storing."""
+    hash_data(test_data)
+    (test_data / "new_file.txt").write_text("a new file")
+    with patch(
+        "flexlock.data_hash._get_dir_stats", wraps=data_hash._get_dir_stats
+    ) as mock_stats:
+        hash_data(test_data)
+    assert mock_stats.call_count == 1
+
+
 def test_small_dir_cache_invalidation_by_add_file(test_data):
     """Test that adding a file to a small dir invalidates the cache."""
     hash1 = hash_data(test_data)
@@ -108,7 +231,7 @@ def test_small_dir_cache_invalidation_by_add_file(test_data):
     assert hash1 != hash2
 
 
-def test_large_dir_fallback_caching(tmp_path, monkeypatch):
+def test_large_dir_fallback_caching(tmp_path, monkeypatch, bump_mtime):
     """Test that large directories fall back to simple mtime caching."""
     monkeypatch.setenv("FLEXLOCK_CACHE_DIR_FILE_LIMIT", "5")
     large_dir = tmp_path / "large_dir"
@@ -119,16 +242,15 @@ def test_large_dir_fallback_caching(tmp_path, monkeypatch):
 
     hash1 = hash_data(large_dir)
     # Now, modify a file inside without touching the parent dir's mtime
-    time.sleep(0.01)
     (large_dir / "file3.txt").write_text("changed")
+    bump_mtime(large_dir / "file3.txt")
 
     # The hash should NOT change because we are in fallback mode
     hash3 = hash_data(large_dir)
     assert hash1 == hash3
 
     # But if we touch the parent directory, it should invalidate
-    time.sleep(0.01)
-    large_dir.touch()
+    bump_mtime(large_dir)
     hash4 = hash_data(large_dir)
     assert hash1 != hash4
 
@@ -162,6 +284,13 @@ def test_cache_dir_file_limit_env_var(tmp_path, monkeypatch):
     assert row[1] is None
 
 
+def test_cache_db_pragmas():
+    """The hash cache runs in WAL mode without a sync on every commit."""
+    with _get_db() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+
 def test_flexlock_no_cache_env_variable(test_data, monkeypatch):
     """Test that FLEXLOCK_NO_CACHE=1 disables the cache."""
     monkeypatch.setenv("FLEXLOCK_NO_CACHE", "1")
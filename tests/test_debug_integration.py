@@ -6,14 +6,16 @@ from flexlock import flexcli
 from flexlock.runner import FlexLockRunner
 
 
-def test_debug_flag_sets_env_var():
+@flexcli
+def failing_fn(x: int = 10):
+    y = x * 2
+    raise ValueError("Test error")
+
+
+def test_debug_flag_sets_env_var(monkeypatch):
     """Test that --debug flag sets FLEXLOCK_DEBUG environment variable."""
     # Clear any existing value
-    os.environ.pop("FLEXLOCK_DEBUG", None)
-
-    @flexcli
-    def dummy_fn(x: int = 10):
-        return {"result": x * 2}
+    monkeypatch.delenv("FLEXLOCK_DEBUG", raising=False)
 
     runner = FlexLockRunner()
 
@@ -27,54 +29,36 @@ def test_debug_flag_sets_env_var():
     # So we need to actually call run() to test this
 
 
-def test_debug_flag_in_runner():
-    """Test that runner sets FLEXLOCK_DEBUG when --debug is passed."""
+def test_debug_flag_in_runner(monkeypatch):
+    """Test that the runner parses --debug, independently of FLEXLOCK_DEBUG."""
     # Clear any existing value
-    os.environ.pop("FLEXLOCK_DEBUG", None)
+    monkeypatch.delenv("FLEXLOCK_DEBUG", raising=False)
 
     runner = FlexLockRunner()
 
-    # Manually set args.debug to simulate --debug flag
-    args = runner.parser.parse_args(["--debug"])
-
-    # The run method should set the environment variable
-    # We'll test this by checking if the environment variable is set
-    # after parsing but before execution
-    assert args.debug is True
+    assert runner.parser.parse_args(["--debug"]).debug is True
+    assert runner.parser.parse_args([]).debug is False
+    # Parsing the flag leaves the environment untouched
+    assert "FLEXLOCK_DEBUG" not in os.environ
 
 
-def test_flexcli_automatic_debug_wrapper():
+def test_flexcli_automatic_debug_wrapper(monkeypatch):
     """Test that @flexcli automatically applies debug_on_fail when FLEXLOCK_DEBUG is set."""
-    # Set the environment variable
-    os.environ["FLEXLOCK_DEBUG"] = "true"
+    # Set the environment variable (restored by monkeypatch on teardown)
+    monkeypatch.setenv("FLEXLOCK_DEBUG", "true")
 
-    try:
-        @flexcli
-        def failing_fn(x: int = 10):
-            y = x * 2
-            raise ValueError("Test error")
-
-        # Call directly (not via runner) - this should apply debug wrapper
-        with pytest.raises(ValueError, match="Test error"):
-            failing_fn(x=5)
-
-        # The debug wrapper should have tried to inject variables
-        # (though in test context they may not be accessible)
+    # Call directly (not via runner) - this should apply debug wrapper
+    with pytest.raises(ValueError, match="Test error"):
+        failing_fn(x=5)
 
-    finally:
-        # Clean up
-        os.environ.pop("FLEXLOCK_DEBUG", None)
+    # The debug wrapper should have tried to inject variables
+    # (though in test context they may not be accessible)
 
 
-def test_flexcli_no_debug_without_env_var():
+def test_flexcli_no_debug_without_env_var(monkeypatch):
     """Test that @flexcli doesn't apply debug wrapper when FLEXLOCK_DEBUG is not set."""
     # Ensure environment variable is not set
-    os.environ.pop("FLEXLOCK_DEBUG", None)
-
-    @flexcli
-    def failing_fn(x: int = 10):
-        y = x * 2
-        raise ValueError("Test error")
+    monkeypatch.delenv("FLEXLOCK_DEBUG", raising=False)
 
     # Call directly - should just raise the error without debug wrapper
     with pytest.raises(ValueError, match="Test error"):
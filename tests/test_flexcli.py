@@ -1,10 +1,5 @@
-import pytest
 from omegaconf import OmegaConf
-import sys
-from unittest.mock import patch, MagicMock
-import inspect
 
-from pathlib import Path
 from flexlock.flexcli import flexcli
 
 
@@ -1,41 +1,54 @@
 import pytest
 from git import Repo
 from pathlib import Path
-import os
+import shutil
 
 from flexlock.git_utils import get_git_commit, create_shadow_snapshot, get_git_tree_hash
 
 
-@pytest.fixture
-def git_repo(tmp_path):
-    """Create a temporary git repository for testing."""
-    repo_dir = tmp_path / "test_repo"
+@pytest.fixture(scope="session")
+def base_git_repo(tmp_path_factory):
+    """Create a git repository with an initial commit once per session.
+
+    Tests that only read the repository may use it directly; tests that
+    modify it must use ``git_repo``, which hands out a private copy.
+    """
+    repo_dir = tmp_path_factory.mktemp("base") / "test_repo"
     repo_dir.mkdir()
     repo = Repo.init(repo_dir)
 
     initial_file = repo_dir / "README.md"
     initial_file.write_text("Initial commit")
     repo.index.add([str(initial_file)])
-    repo.config_writer().set_value("user", "name", "Test User").release()
-    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    with repo.config_writer() as writer:
+        writer.set_value("user", "name", "Test User")
+        writer.set_value("user", "email", "test@example.com")
     repo.index.commit("Initial commit")
 
     return repo
 
 
-def test_get_git_commit(git_repo):
+@pytest.fixture
+def git_repo(tmp_path, base_git_repo):
+    """Create a temporary git repository for testing."""
+    repo_dir = tmp_path / "test_repo"
+    shutil.copytree(base_git_repo.working_dir, repo_dir, symlinks=True)
+    return Repo(repo_dir)
+
+
+def test_get_git_commit(base_git_repo):
     """Test that get_git_commit returns the correct commit hash."""
-    expected_hash = git_repo.head.commit.hexsha
-    actual_hash = get_git_commit(path=git_repo.working_dir)
+    expected_hash = base_git_repo.head.commit.hexsha
+    actual_hash = get_git_commit(path=base_git_repo.working_dir)
     assert actual_hash == expected_hash
 
 
 
 
-def test_get_git_tree_hash(git_repo):
+def test_get_git_tree_hash(base_git_repo):
     """Test that get_git_tree_hash returns the correct tree hash."""
-    expected_tree_hash = git_repo.head.commit.tree.hexsha
-    actual_hash = get_git_tree_hash(path=git_repo.working_dir)
+    expected_tree_hash = base_git_repo.head.commit.tree.hexsha
+    actual_hash = get_git_tree_hash(path=base_git_repo.working_dir)
     assert actual_hash == expected_tree_hash
 
 
@@ -114,4 +127,37 @@ def test_shadow_snapshot_ignores_patterns(git_repo):
     result_without_ignore = create_shadow_snapshot(repo_path=str(repo_dir))
 
     # The tree hashes should be different since we're including all files in the second case
-    assert result_with_ignore["tree"] != result_without_ignore["tree"]
\ No newline at end of file
+    assert result_with_ignore["tree"] != result_without_ignore["tree"]
+
+
+def test_repo_for_caches_and_tracks_new_commits(git_repo):
+    """The cached repo is reused and still sees commits made afterwards."""
+    from flexlock.git_utils import _repo_for
+
+    repo_dir = git_repo.working_dir
+    assert _repo_for(repo_dir) is _repo_for(repo_dir)
+
+    new_file = Path(repo_dir) / "new.txt"
+    new_file.write_text("more")
+    git_repo.index.add([str(new_file)])
+    git_repo.index.commit("Second commit")
+
+    assert get_git_commit(path=repo_dir) == git_repo.head.commit.hexsha
+
+
+def test_is_dirty_matches_gitpython(git_repo):
+    """The single-call dirty check agrees with GitPython in each working tree state."""
+    from flexlock.git_utils import _is_dirty
+
+    repo_dir = Path(git_repo.working_dir)
+    assert _is_dirty(git_repo) is False
+
+    (repo_dir / "untracked.txt").write_text("new")
+    assert _is_dirty(git_repo) is git_repo.is_dirty(untracked_files=True) is True
+    (repo_dir / "untracked.txt").unlink()
+
+    (repo_dir / "README.md").write_text("modified")
+    assert _is_dirty(git_repo) is git_repo.is_dirty(untracked_files=True) is True
+
+    git_repo.index.add(["README.md"])
+    assert _is_dirty(git_repo) is git_repo.is_dirty(untracked_files=True) is True
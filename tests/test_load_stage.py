@@ -1,15 +1,18 @@
 """Tests for load_stage module — lineage/prevs backwards compatibility."""
 
+import json
 import pytest
 import yaml
-from pathlib import Path
 
-from flexlock.load_stage import load_stage_from_path, _load_and_flatten_recursively
+from flexlock.load_stage import load_stage_from_path
 
 
 @pytest.fixture
 def run_tree(tmp_path):
-    """Create a tree of run directories with run.lock files for testing lineage."""
+    """Create a tree of run directories with run.lock files for testing lineage.
+
+    The files are written as JSON, which the YAML loader reads unchanged.
+    """
 
     def _make_run(name, config, lineage=None, lineage_key="lineage"):
         run_dir = tmp_path / name
@@ -20,7 +23,7 @@ def run_tree(tmp_path):
         }
         if lineage:
             data[lineage_key] = lineage
-        (run_dir / "run.lock").write_text(yaml.dump(data))
+        (run_dir / "run.lock").write_text(json.dumps(data))
         return str(run_dir)
 
     return _make_run
@@ -81,7 +84,7 @@ def test_load_stage_lineage_preferred_over_prevs(run_tree, tmp_path):
         "lineage": {"upstream_new": {"path": upstream_new}},
         "prevs": {"upstream_old": {"config": {"save_dir": upstream_old}}},
     }
-    (mixed_dir / "run.lock").write_text(yaml.dump(data))
+    (mixed_dir / "run.lock").write_text(json.dumps(data))
 
     result = load_stage_from_path(str(mixed_dir))
     # Should follow lineage (new) not prevs (legacy)
@@ -155,7 +158,7 @@ def test_load_stage_missing_path_in_lineage(run_tree, tmp_path):
         "config": {"save_dir": "bad"},
         "lineage": {"broken": {}},  # no path, no config.save_dir
     }
-    (bad_dir / "run.lock").write_text(yaml.dump(data))
+    (bad_dir / "run.lock").write_text(json.dumps(data))
 
     with pytest.raises(ValueError, match="Could not find path"):
         load_stage_from_path(str(bad_dir))
@@ -174,3 +177,42 @@ def test_lineage_stripped_from_output(run_tree):
     for stage_data in result.values():
         assert "lineage" not in stage_data
         assert "prevs" not in stage_data
+
+
+def test_load_stage_parses_shared_lock_once(run_tree):
+    """A shared ancestor's run.lock is parsed once across repeated loads."""
+    from unittest.mock import patch
+    import flexlock.load_stage as load_stage
+
+    shared = run_tree("shared_once", {"save_dir": "shared_once"})
+    left = run_tree("left", {"save_dir": "left"}, lineage={"shared_once": {"path": shared}})
+    right = run_tree("right", {"save_dir": "right"}, lineage={"shared_once": {"path": shared}})
+
+    with patch.dict(load_stage._RUN_LOCK_CACHE, clear=True), patch(
+        "flexlock.load_stage.yaml.load", wraps=yaml.load
+    ) as mock_load:
+        first = load_stage_from_path(left)
+        second = load_stage_from_path(right)
+        assert mock_load.call_count == 3  # shared_once, left, right
+
+    assert first["shared_once"] == second["shared_once"]
+    assert first["shared_once"] is not second["shared_once"]
+
+
+def test_run_lock_cache_is_bounded(run_tree, monkeypatch):
+    """The run.lock cache keys on absolute paths and evicts the oldest entry."""
+    import os
+    from unittest.mock import patch
+    import flexlock.load_stage as load_stage
+
+    paths = [run_tree(f"run_{i}", {"save_dir": f"run_{i}"}) for i in range(3)]
+    monkeypatch.setattr(load_stage, "_RUN_LOCK_CACHE_SIZE", 2)
+    monkeypatch.chdir(paths[0])
+
+    with patch.dict(load_stage._RUN_LOCK_CACHE, clear=True):
+        load_stage.load_run_lock("run.lock")
+        for path in paths:
+            load_stage.load_run_lock(os.path.join(path, "run.lock"))
+        assert list(load_stage._RUN_LOCK_CACHE) == [
+            os.path.join(path, "run.lock") for path in paths[1:]
+        ]
@@ -1,16 +1,21 @@
 import pytest
 from unittest.mock import patch, MagicMock, Mock
+from collections import namedtuple
 from pathlib import Path
 import yaml
 
 # Import the functions to be tested
-from flexlock.mlflow import mlflow_context
+from flexlock.mlflow import mlflow_context, _flatten_dict
+from flexlock.utils import YamlDumper
 
 
-@pytest.fixture
-def dummy_run_files(tmp_path):
-    """Create dummy run.lock and log files for testing."""
-    save_dir = tmp_path / "test_save_dir"
+@pytest.fixture(scope="session")
+def dummy_run_files(tmp_path_factory):
+    """Create dummy run.lock and log files for testing.
+
+    Built once per session: tests must treat these files as read-only.
+    """
+    save_dir = tmp_path_factory.mktemp("mlflow") / "test_save_dir"
     save_dir.mkdir()
 
     run_lock_content = {
@@ -20,7 +25,7 @@ def dummy_run_files(tmp_path):
             "save_dir": str(save_dir),
         }
     }
-    (save_dir / "run.lock").write_text(yaml.dump(run_lock_content))
+    (save_dir / "run.lock").write_text(yaml.dump(run_lock_content, Dumper=YamlDumper))
     (save_dir / "experiment.log").write_text("This is a log.")
 
     return save_dir
@@ -34,6 +39,7 @@ def mock_mlflow_module():
     # Mock the run object that `start_run` returns
     mock_run = MagicMock()
     mock_run.info.run_id = "test_run_id"
+    mlflow_mock.start_run.return_value.info.run_id = "test_run_id"
 
     # Mock the context manager part of start_run
     mlflow_mock.start_run.return_value.__enter__.return_value = mock_run
@@ -53,21 +59,47 @@ def mock_mlflow_module():
     # Create MlflowClient class mock
     mlflow_mock.tracking.MlflowClient = Mock(return_value=mock_client)
 
+    # Entities used for batched logging
+    mlflow_mock.entities.RunTag = namedtuple("RunTag", ["key", "value"])
+    mlflow_mock.entities.Param = namedtuple("Param", ["key", "value"])
+
     return mlflow_mock
 
 
-def test_mlflow_context_starts_run_and_sets_tags(dummy_run_files, mock_mlflow_module):
-    """Test that the context manager starts a run and sets the correct initial tags."""
-    with patch.dict(
+@pytest.fixture(autouse=True)
+def _clear_last_run_ids():
+    """Start every test without run ids remembered from earlier contexts."""
+    with patch.dict("flexlock.mlflow._LAST_RUN_IDS", clear=True):
+        yield
+
+
+def _patched_mlflow(mlflow_mock):
+    """Install ``mlflow_mock`` as the mlflow package and its submodules."""
+    return patch.dict(
         "sys.modules",
         {
-            "mlflow": mock_mlflow_module,
-            "mlflow.tracking": mock_mlflow_module.tracking,
+            "mlflow": mlflow_mock,
+            "mlflow.tracking": mlflow_mock.tracking,
+            "mlflow.entities": mlflow_mock.entities,
         },
-    ):
-        # Re-import to get mocked version
-        from flexlock.mlflow import mlflow_context
+    )
+
+
+def _logged_batches(mlflow_mock, run_id):
+    """Collect tags and params sent through MlflowClient.log_batch for ``run_id``."""
+    client_mock = mlflow_mock.tracking.MlflowClient.return_value
+    tags, params = {}, {}
+    for call in client_mock.log_batch.call_args_list:
+        if call[0][0] != run_id:
+            continue
+        tags.update({t.key: t.value for t in call[1].get("tags", [])})
+        params.update({p.key: p.value for p in call[1].get("params", [])})
+    return tags, params
+
 
+def test_mlflow_context_starts_run_and_sets_tags(dummy_run_files, mock_mlflow_module):
+    """Test that the context manager starts a run and sets the correct initial tags."""
+    with _patched_mlflow(mock_mlflow_module):
         with mlflow_context(save_dir=str(dummy_run_files), experiment_name="TestExp"):
             pass
 
@@ -75,8 +107,7 @@ def test_mlflow_context_starts_run_and_sets_tags(dummy_run_files, mock_mlflow_mo
     assert mock_mlflow_module.start_run.called
 
     # Check that tags are set correctly with new tag names
-    mock_mlflow_module.set_tags.assert_called_once()
-    tags_arg = mock_mlflow_module.set_tags.call_args[0][0]
+    tags_arg, _ = _logged_batches(mock_mlflow_module, "test_run_id")
 
     assert "flexlock.dir" in tags_arg
     assert tags_arg["flexlock.dir"] == str(dummy_run_files.as_posix())
@@ -86,21 +117,12 @@ def test_mlflow_context_starts_run_and_sets_tags(dummy_run_files, mock_mlflow_mo
 
 def test_mlflow_context_logs_artifacts_and_params(dummy_run_files, mock_mlflow_module):
     """Test that artifacts and parameters are logged on exit."""
-    with patch.dict(
-        "sys.modules",
-        {
-            "mlflow": mock_mlflow_module,
-            "mlflow.tracking": mock_mlflow_module.tracking,
-        },
-    ):
-        from flexlock.mlflow import mlflow_context
-
+    with _patched_mlflow(mock_mlflow_module):
         with mlflow_context(save_dir=str(dummy_run_files)):
             pass
 
     # Check that parameters were logged (with new flattening)
-    assert mock_mlflow_module.log_params.called
-    params_arg = mock_mlflow_module.log_params.call_args[0][0]
+    _, params_arg = _logged_batches(mock_mlflow_module, "test_run_id")
 
     assert "param1" in params_arg or "config.param1" in params_arg
     assert "nested.key" in params_arg or "config.nested.key" in params_arg
@@ -116,39 +138,27 @@ def test_mlflow_context_logs_artifacts_and_params(dummy_run_files, mock_mlflow_m
 
 def test_mlflow_context_deprecates_previous_run(dummy_run_files, mock_mlflow_module):
     """Test that the previous active run is deprecated on exit using MlflowClient."""
-    with patch.dict(
-        "sys.modules",
-        {
-            "mlflow": mock_mlflow_module,
-            "mlflow.tracking": mock_mlflow_module.tracking,
-        },
-    ):
-        from flexlock.mlflow import mlflow_context
-
+    with _patched_mlflow(mock_mlflow_module):
         with mlflow_context(save_dir=str(dummy_run_files)):
             pass
 
     # Get the mock client instance
     client_mock = mock_mlflow_module.tracking.MlflowClient.return_value
 
-    # Verify client.set_tag was called to deprecate the previous run
-    set_tag_calls = client_mock.set_tag.call_args_list
-
-    # Should have two calls: one for status, one for superseded_by
-    assert len(set_tag_calls) == 2
-
-    # Extract call arguments
-    call_tuples = [(call[0][0], call[0][1]) for call in set_tag_calls]
-
-    # Check that both tags were set on the previous run
-    assert ("previous_run_id", "flexlock.status") in call_tuples
-    assert ("previous_run_id", "flexlock.superseded_by") in call_tuples
-
-    # Verify the status value is "deprecated"
-    for call in set_tag_calls:
-        if call[0][1] == "flexlock.status":
-            assert call[0][2] == "deprecated"
-
+    # Verify the previous run was deprecated with a single batched call
+    client_mock.set_tag.assert_not_called()
+    prev_calls = [
+        call
+        for call in client_mock.log_batch.call_args_list
+        if call[0][0] == "previous_run_id"
+    ]
+    assert len(prev_calls) == 1
+
+    tags = {tag.key: tag.value for tag in prev_calls[0][1]["tags"]}
+    assert tags == {
+        "flexlock.status": "deprecated",
+        "flexlock.superseded_by": "test_run_id",
+    }
 
 
 def test_mlflow_context_no_previous_run(dummy_run_files, mock_mlflow_module):
@@ -157,37 +167,24 @@ def test_mlflow_context_no_previous_run(dummy_run_files, mock_mlflow_module):
     client_mock = mock_mlflow_module.tracking.MlflowClient.return_value
     client_mock.search_runs.return_value = []
 
-    with patch.dict(
-        "sys.modules",
-        {
-            "mlflow": mock_mlflow_module,
-            "mlflow.tracking": mock_mlflow_module.tracking,
-        },
-    ):
-        from flexlock.mlflow import mlflow_context
-
+    with _patched_mlflow(mock_mlflow_module):
         with mlflow_context(save_dir=str(dummy_run_files)):
             pass
 
     # Verify tags don't include supersedes
-    tags_arg = mock_mlflow_module.set_tags.call_args[0][0]
+    tags_arg, _ = _logged_batches(mock_mlflow_module, "test_run_id")
     assert "flexlock.supersedes" not in tags_arg
 
     # Verify no deprecation calls (no previous run to deprecate)
     client_mock.set_tag.assert_not_called()
+    assert all(
+        call[0][0] == "test_run_id" for call in client_mock.log_batch.call_args_list
+    )
 
 
 def test_mlflow_context_custom_tags(dummy_run_files, mock_mlflow_module):
     """Test that custom tags are added correctly."""
-    with patch.dict(
-        "sys.modules",
-        {
-            "mlflow": mock_mlflow_module,
-            "mlflow.tracking": mock_mlflow_module.tracking,
-        },
-    ):
-        from flexlock.mlflow import mlflow_context
-
+    with _patched_mlflow(mock_mlflow_module):
         custom_tags = {"model": "resnet50", "dataset": "imagenet"}
 
         with mlflow_context(
@@ -197,40 +194,25 @@ def test_mlflow_context_custom_tags(dummy_run_files, mock_mlflow_module):
             pass
 
     # Verify custom tags are included
-    tags_arg = mock_mlflow_module.set_tags.call_args[0][0]
+    tags_arg, _ = _logged_batches(mock_mlflow_module, "test_run_id")
     assert tags_arg["model"] == "resnet50"
     assert tags_arg["dataset"] == "imagenet"
 
 
 def test_mlflow_context_log_config_false(dummy_run_files, mock_mlflow_module):
     """Test that log_config=False skips parameter logging."""
-    with patch.dict(
-        "sys.modules",
-        {
-            "mlflow": mock_mlflow_module,
-            "mlflow.tracking": mock_mlflow_module.tracking,
-        },
-    ):
-        from flexlock.mlflow import mlflow_context
-
+    with _patched_mlflow(mock_mlflow_module):
         with mlflow_context(save_dir=str(dummy_run_files), log_config=False):
             pass
 
     # Parameters should not be logged
-    assert not mock_mlflow_module.log_params.called
+    _, params_arg = _logged_batches(mock_mlflow_module, "test_run_id")
+    assert params_arg == {}
 
 
 def test_mlflow_context_log_artifacts_false(dummy_run_files, mock_mlflow_module):
     """Test that log_artifacts=False skips artifact logging (except manual logs)."""
-    with patch.dict(
-        "sys.modules",
-        {
-            "mlflow": mock_mlflow_module,
-            "mlflow.tracking": mock_mlflow_module.tracking,
-        },
-    ):
-        from flexlock.mlflow import mlflow_context
-
+    with _patched_mlflow(mock_mlflow_module):
         with mlflow_context(save_dir=str(dummy_run_files), log_artifacts=False):
             pass
 
@@ -244,3 +226,98 @@ def test_mlflow_context_log_artifacts_false(dummy_run_files, mock_mlflow_module)
     # But experiment.log should NOT be logged (part of log_artifacts)
     # Note: this depends on implementation - if both log_config and log_artifacts are False,
     # nothing gets logged except what user explicitly logs
+
+
+def test_flatten_dict_nested_keys():
+    """Nested dicts are flattened with dot-separated keys; lists are kept as leaves."""
+    nested = {"a": 1, "b": {"c": 2, "d": {"e": [1, 2]}}, "f": {}}
+    assert _flatten_dict(nested) == {"a": 1, "b.c": 2, "b.d.e": [1, 2]}
+
+
+def test_mlflow_context_chunks_params(tmp_path, mock_mlflow_module):
+    """Params are sent in batches of at most 100, after a tags-only batch."""
+    (tmp_path / "run.lock").write_text(
+        yaml.dump({"config": {f"p{i}": i for i in range(250)}}, Dumper=YamlDumper)
+    )
+
+    with _patched_mlflow(mock_mlflow_module):
+        with mlflow_context(save_dir=str(tmp_path)):
+            pass
+
+    client_mock = mock_mlflow_module.tracking.MlflowClient.return_value
+    calls = [
+        call for call in client_mock.log_batch.call_args_list if call[0][0] == "test_run_id"
+    ]
+    assert calls[0][1]["tags"] and "params" not in calls[0][1]
+    assert [len(call[1]["params"]) for call in calls[1:]] == [100, 100, 50]
+
+    _, params_arg = _logged_batches(mock_mlflow_module, "test_run_id")
+    assert params_arg["p249"] == "249"
+
+
+def test_mlflow_context_survives_rejected_params(dummy_run_files, mock_mlflow_module):
+    """A param batch the server rejects only warns: tags are kept, the block runs."""
+    client_mock = mock_mlflow_module.tracking.MlflowClient.return_value
+
+    def _log_batch(run_id, params=None, tags=None):
+        if params:
+            raise Exception("INVALID_PARAMETER_VALUE")
+
+    client_mock.log_batch.side_effect = _log_batch
+    reached = False
+
+    with _patched_mlflow(mock_mlflow_module):
+        with mlflow_context(save_dir=str(dummy_run_files)):
+            reached = True
+
+    assert reached
+    tags_arg, _ = _logged_batches(mock_mlflow_module, "test_run_id")
+    assert tags_arg["flexlock.status"] == "active"
+
+
+def test_mlflow_context_inherits_tags_from_search_result(
+    dummy_run_files, mock_mlflow_module
+):
+    """User tags are inherited from the searched run without a get_run call."""
+    client_mock = mock_mlflow_module.tracking.MlflowClient.return_value
+    prev_run = client_mock.search_runs.return_value[0]
+    prev_run.data.tags = {
+        "pipeline_run": "run_001",
+        "flexlock.status": "active",
+        "mlflow.runName": "old",
+    }
+
+    with _patched_mlflow(mock_mlflow_module):
+        with mlflow_context(save_dir=str(dummy_run_files)):
+            pass
+
+    client_mock.get_run.assert_not_called()
+    tags_arg, _ = _logged_batches(mock_mlflow_module, "test_run_id")
+    assert tags_arg["pipeline_run"] == "run_001"
+    assert "mlflow.runName" not in tags_arg
+
+
+def test_mlflow_context_reuses_known_run_id(dummy_run_files, mock_mlflow_module):
+    """A second context on the same directory looks up the previous run by id."""
+    client_mock = mock_mlflow_module.tracking.MlflowClient.return_value
+    client_mock.search_runs.return_value = []
+    logical_id = Path(dummy_run_files).resolve().as_posix()
+    known_run = MagicMock()
+    known_run.info.run_id = "test_run_id"
+    known_run.info.experiment_id = "test_experiment_id"
+    known_run.data.tags = {"flexlock.dir": logical_id, "flexlock.status": "active"}
+    client_mock.get_run.return_value = known_run
+
+    with _patched_mlflow(mock_mlflow_module):
+        with mlflow_context(save_dir=str(dummy_run_files)):
+            pass
+        assert client_mock.search_runs.call_count == 1
+        client_mock.get_run.assert_not_called()
+
+        with mlflow_context(save_dir=str(dummy_run_files)):
+            pass
+
+    client_mock.get_run.assert_called_once_with("test_run_id")
+    assert client_mock.search_runs.call_count == 1
+    tags_arg, _ = _logged_batches(mock_mlflow_module, "test_run_id")
+    assert tags_arg["flexlock.supersedes"] == "test_run_id"
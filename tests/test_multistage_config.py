@@ -9,11 +9,11 @@ import sys
 import tempfile
 import pytest
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from omegaconf import OmegaConf
 from flexlock import flexcli
 from loguru import logger
-logger.enable("flexlock")
+
 # --- Helpers ---
 
 @pytest.fixture
@@ -37,7 +37,7 @@ def mock_argv(args):
 def main(p, save_dir=None):
     return p
 
-def test_interpolation_with_selection(temp_yaml):
+def test_interpolation_with_selection(temp_yaml, tmp_path):
     """
     Test that selecting a sub-node (Inner Config) retains access to 
     variables defined in the Root (Outer Config) via interpolation.
@@ -53,7 +53,7 @@ experiments:
     # This interpolation requires access to the root node
     p: ${global_param}
     save_dir: "/tmp/flexlock_test/exp_a"
-""")
+""".replace("/tmp/flexlock_test", tmp_path.as_posix()))
     f.close()
 
 
@@ -72,7 +72,7 @@ def main3(p, save_dir):
     results.append(p)
     return p
 
-def test_interpolation_in_sweep_list(temp_yaml):
+def test_interpolation_in_sweep_list(temp_yaml, tmp_path):
     """
     Test that items in a sweep list (defined in root) can interpolate 
     values from the root config when injected into the selected node.
@@ -94,9 +94,9 @@ base_exp:
 grid:
   - p: 5
   - p: ${global_mult}
-""")
+""".replace("/tmp/flexlock_test", tmp_path.as_posix()))
     f.close()
-
+    results.clear()
 
     # Run sweep
     with mock_argv([
@@ -116,12 +116,14 @@ grid:
 def main2(param, other, save_dir):
     return param, other
 
-def test_inner_vs_outer_overrides(temp_yaml):
+def test_inner_vs_outer_overrides(temp_yaml, tmp_path, monkeypatch):
     """
     Test the distinction between:
     - Outer Overrides (-o): Affect global config (before selection).
     - Inner Overrides (-O): Affect selected config (after selection).
     """
+    # No save_dir in the config: the default outputs/ tree goes to tmp_path
+    monkeypatch.chdir(tmp_path)
     f, config_path = temp_yaml
     f.write("""
 global_val: 10
@@ -157,15 +159,16 @@ nested:
 
 # 1. Function with defaults (Schema)
 @flexcli
-def train(lr=0.01, epochs=10, save_dir='/tmp/flexlock_test'):
+def train(lr=0.01, epochs=10, save_dir='flexlock_test'):
     return {"lr": lr, "epochs": epochs}
 
-def test_py2cfg_defaults_and_overrides():
+def test_py2cfg_defaults_and_overrides(tmp_path, monkeypatch):
     """
     Test that function signature defaults are preserved and can be overridden.
     This validates the 'implicit schema' philosophy.
     """
-    
+    # The default save_dir is relative: keep run artifacts in tmp_path
+    monkeypatch.chdir(tmp_path)
 
     # Case A: Run with defaults (No args)
     with mock_argv([]):
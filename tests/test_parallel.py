@@ -3,10 +3,8 @@ from omegaconf import OmegaConf
 from pathlib import Path
 import yaml
 from unittest.mock import patch, MagicMock
-from loguru import logger
 from flexlock.parallel import ParallelExecutor
-
-logger.enable("flexlock")
+from flexlock.utils import YamlLoader
 
 
 @pytest.fixture
@@ -40,7 +38,6 @@ def test_parallel_executor_local_execution(base_cfg):
         n_jobs=2,
     )
     success = executor.run()
-    logger.info(executor.db_path)
 
     # Should return True for successful execution
     assert success is True
@@ -50,7 +47,7 @@ def test_parallel_executor_local_execution(base_cfg):
     assert results_file.exists()
 
     with open(results_file, "r") as f:
-        results = yaml.safe_load(f)
+        results = yaml.load(f, Loader=YamlLoader)
 
     assert len(results) == 4
     assert all(item["status"] == "done" for item in results)
@@ -64,7 +61,6 @@ def test_executor_handles_no_tasks(base_cfg):
     executor = ParallelExecutor(
         func=dummy_task_func, tasks=[], task_target=".", cfg=base_cfg, n_jobs=1
     )
-    logger.info(executor.db_path)
     executor.run()
     # The results file should still be created, but it should be empty
     results_file = Path(base_cfg.save_dir) / "run.lock.tasks"
@@ -139,35 +135,40 @@ def test_task_failure_is_recorded(base_cfg):
     # Check the database state directly via the dump function
     db_path = Path(base_cfg.save_dir) / "run.lock.tasks.db"
 
-    from flexlock.taskdb import _conn
+    from flexlock.taskdb import _conn, _hash_task
 
+    # Look both tasks up by their primary key in one query
     with _conn(executor.db_path) as c:
-        # Check task 0 (success)
-        success_task = c.execute(
-            "SELECT status, error, result_info FROM tasks WHERE task_info LIKE '%task_id: 0%'"
-        ).fetchone()
-        assert success_task[0] == "done"
-        assert success_task[1] is None
-
-        # Check task 1 (failure)
-        failed_task = c.execute(
-            "SELECT status, error, result_info FROM tasks WHERE task_info LIKE '%task_id: 1%'"
-        ).fetchone()
-        assert failed_task[0] == "failed"
-        assert "This task is designed to fail" in failed_task[1]
-        assert failed_task[2] is None
+        cursor = c.execute(
+            "SELECT task_id, status, error, result_info FROM tasks WHERE task_id IN (?, ?)",
+            [_hash_task(t) for t in tasks],
+        )
+        rows = {row[0]: row[1:] for row in cursor}
+    success_task = rows[_hash_task(tasks[0])]
+    failed_task = rows[_hash_task(tasks[1])]
+
+    # Check task 0 (success)
+    assert success_task[0] == "done"
+    assert success_task[1] is None
+
+    # Check task 1 (failure)
+    assert failed_task[0] == "failed"
+    assert "This task is designed to fail" in failed_task[1]
+    assert failed_task[2] is None
 
 
 def test_wait_parameter_with_local_execution(base_cfg):
     """Tests that wait parameter works correctly with local execution."""
     tasks = [{"task_id": i, "worker_id": "local"} for i in range(4)]
 
+    # In-process worker: spawned workers are covered by
+    # test_parallel_executor_local_execution
     executor = ParallelExecutor(
         func=dummy_task_func,
         tasks=tasks,
         task_target=".",
         cfg=base_cfg,
-        n_jobs=2,
+        n_jobs=1,
     )
 
     # Local execution always completes synchronously, wait is implicit
@@ -354,3 +355,42 @@ def test_config_constants_used():
         # Test _wait_for_completion also accepts None
         sig2 = inspect.signature(executor._wait_for_completion)
         assert sig2.parameters['poll_interval'].default is None
+
+
+def test_claim_next_task_returns_envelope(tmp_path):
+    """Claimed tasks carry their DB id so finishing them needs no re-hash."""
+    from flexlock.taskdb import (
+        claim_next_task,
+        finish_task,
+        get_status_counts,
+        queue_tasks,
+    )
+
+    db = tmp_path / "tasks.db"
+    queue_tasks(db, [OmegaConf.create({"x": 1})])
+
+    claimed = claim_next_task(db, "node")
+    assert claimed.task.x == 1
+    assert len(claimed.task_id) == 40
+
+    finish_task(db, claimed.task, result={"ok": True}, task_id=claimed.task_id)
+    assert get_status_counts(db) == {"done": 1}
+    assert claim_next_task(db, "node") is None
+
+
+def test_dump_to_yaml_skips_unchanged_file(tmp_path):
+    """Re-dumping an unchanged task table leaves the YAML file untouched."""
+    import os
+    from flexlock.taskdb import claim_next_task, dump_to_yaml, finish_task, queue_tasks
+
+    db = tmp_path / "tasks.db"
+    out = tmp_path / "run.lock.tasks"
+    queue_tasks(db, [OmegaConf.create({"x": 1})])
+    claimed = claim_next_task(db, "node")
+    finish_task(db, claimed.task, result={"x": 1, "ok": True}, task_id=claimed.task_id)
+
+    dump_to_yaml(db, out)
+    os.utime(out, (0, 0))
+    dump_to_yaml(db, out)
+    assert out.stat().st_mtime == 0
+    assert yaml.load(out.read_text(), Loader=YamlLoader)[0]["task"]["ok"] is True
@@ -1,12 +1,7 @@
 """Tests for the progressive framework functionality."""
 
-import tempfile
-import os
-from pathlib import Path
 import sys
-from unittest.mock import patch, MagicMock
 
-import pytest
 from omegaconf import OmegaConf
 
 from flexlock import flexcli, py2cfg
@@ -48,6 +48,25 @@ def test_vinc_resolver(tmp_path):
     assert path3 == str(tmp_path / "experiment_0006")
 
 
+def test_vinc_resolver_glob_characters_in_name(tmp_path):
+    """Brackets in the base name are matched literally, not as a glob pattern."""
+    base_path = tmp_path / "exp[1]"
+    (tmp_path / "exp[1]_0003").mkdir()
+    (tmp_path / "exp1_0007").mkdir()
+
+    assert vinc_resolver(str(base_path)) == str(tmp_path / "exp[1]_0004")
+
+
+def test_vinc_resolver_not_cached_across_merges(tmp_path):
+    """Configs merged from a resolved base see directories created since."""
+    base_path = tmp_path / "experiment"
+    base = OmegaConf.create({"save_dir": f"${{vinc:{base_path}}}"})
+    Path(base.save_dir).mkdir()
+
+    task = OmegaConf.merge(base, {"param": 1})
+    assert task.save_dir == str(tmp_path / "experiment_0001")
+
+
 def test_vinc_resolver_with_custom_format(tmp_path):
     """Test vinc_resolver with a custom format string."""
     base_path = tmp_path / "run"
@@ -63,10 +82,9 @@ def test_vinc_resolver_with_custom_format(tmp_path):
     assert path2 == str(tmp_path / "run-v01")
 
 
-def test_latest_resolver(tmp_path):
+def test_latest_resolver(tmp_path, bump_mtime):
     """Test the latest_resolver returns the most recently modified path."""
     from flexlock.resolvers import latest_resolver
-    import time
 
     # Create test directories with different modification times
     dir1 = tmp_path / "results_0001"
@@ -75,10 +93,10 @@ def test_latest_resolver(tmp_path):
 
     # Create in sequence to ensure different modification times
     dir1.mkdir()
-    time.sleep(0.01)  # Small delay to ensure different timestamp
     dir2.mkdir()
-    time.sleep(0.01)  # Small delay to ensure different timestamp
+    bump_mtime(dir2, after=dir1)
     dir3.mkdir()
+    bump_mtime(dir3, after=dir2)
 
     # Test with glob pattern
     pattern = str(tmp_path / "results_*")
@@ -88,10 +106,9 @@ def test_latest_resolver(tmp_path):
     assert latest == str(dir3)
 
 
-def test_latest_resolver_with_files(tmp_path):
+def test_latest_resolver_with_files(tmp_path, bump_mtime):
     """Test the latest_resolver works with files too."""
     from flexlock.resolvers import latest_resolver
-    import time
 
     # Create test files with different modification times
     file1 = tmp_path / "data_v1.txt"
@@ -100,10 +117,10 @@ def test_latest_resolver_with_files(tmp_path):
 
     # Create files in sequence
     file1.write_text("content1")
-    time.sleep(0.01)
     file2.write_text("content2")
-    time.sleep(0.01)
+    bump_mtime(file2, after=file1)
     file3.write_text("content3")
+    bump_mtime(file3, after=file2)
 
     # Test with glob pattern
     pattern = str(tmp_path / "data_v*.txt")
@@ -125,10 +142,9 @@ def test_latest_resolver_no_matches():
     assert result == pattern
 
 
-def test_latest_resolver_with_globbing_patterns(tmp_path):
+def test_latest_resolver_with_globbing_patterns(tmp_path, bump_mtime):
     """Test latest_resolver with different globbing patterns."""
     from flexlock.resolvers import latest_resolver
-    import time
 
     # Create a nested directory structure
     subdir1 = tmp_path / "subdir1"
@@ -140,8 +156,8 @@ def test_latest_resolver_with_globbing_patterns(tmp_path):
     file1 = subdir1 / "file.txt"
     file2 = subdir2 / "file.txt"
     file1.write_text("content1")
-    time.sleep(0.01)
     file2.write_text("content2")
+    bump_mtime(file2, after=file1)
 
     # Use recursive pattern
     pattern = str(tmp_path / "**" / "file.txt")
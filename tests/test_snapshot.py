@@ -1,14 +1,13 @@
 import pytest
-from git import Repo
 from pathlib import Path
 from omegaconf import OmegaConf
 import yaml
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import tempfile
-import os
+import shutil
 from loguru import logger
-logger.enable("flexlock")
 from flexlock.snapshot import snapshot, RunTracker
+from flexlock.utils import YamlLoader
 
 
 def test_runtracker_initialization():
@@ -48,6 +47,35 @@ def test_runtracker_record_data():
         mock_hash.assert_called_once_with("/path/to/data")
 
 
+def test_runtracker_record_data_multiple_paths():
+    """Test that several data paths are hashed and keyed by name in order."""
+    tracker = RunTracker(Path("test_run"))
+
+    with patch("flexlock.snapshot.hash_data", side_effect=lambda p: f"hash_{p}"):
+        tracker.record_data({"train": "/data/train", "test": "/data/test"})
+
+    assert list(tracker.data["data"]) == ["train", "test"]
+    assert tracker.data["data"]["train"] == "hash_/data/train"
+    assert tracker.data["data"]["test"] == "hash_/data/test"
+
+
+def test_runtracker_record_data_reuses_hash_threads():
+    """Hashing threads outlive record_data, keeping their cache connections."""
+    import threading
+
+    threads = set()
+
+    def _hash(path):
+        threads.add(threading.current_thread())
+        return f"hash_{path}"
+
+    with patch("flexlock.snapshot.hash_data", side_effect=_hash):
+        RunTracker(Path("test_run")).record_data({"a": "/data/a", "b": "/data/b"})
+
+    assert threads
+    assert all(t.is_alive() for t in threads)
+
+
 def test_runtracker_record_env():
     """Test RunTracker environment recording."""
     save_dir = Path("test_run")
@@ -64,6 +92,28 @@ def test_runtracker_record_env():
         assert tracker.data["repos"]["main"]["is_dirty"] == False
 
 
+def test_runtracker_record_env_multiple_repos():
+    """Test that several repos are snapshotted and keep their own metadata."""
+    tracker = RunTracker(Path("test_run"))
+
+    with patch("flexlock.snapshot.create_shadow_snapshot") as mock_snapshot:
+        mock_snapshot.side_effect = lambda path, ref_name: {"tree": f"tree_{path}"}
+
+        tracker.record_env(
+            {
+                "main": {"path": "/repo/main", "module": "main_pkg"},
+                "lib": {"path": "/repo/lib", "include": ["src/*.py"]},
+            }
+        )
+
+    assert list(tracker.data["repos"]) == ["main", "lib"]
+    assert tracker.data["repos"]["main"]["tree"] == "tree_/repo/main"
+    assert tracker.data["repos"]["main"]["module"] == "main_pkg"
+    assert tracker.data["repos"]["lib"]["tree"] == "tree_/repo/lib"
+    assert tracker.data["repos"]["lib"]["include"] == ["src/*.py"]
+    assert mock_snapshot.call_count == 2
+
+
 def test_runtracker_record_env_with_parent():
     """Test RunTracker environment recording with parent (should skip)."""
     save_dir = Path("test_run")
@@ -119,13 +169,72 @@ def test_runtracker_save():
             assert lock_file.exists()
             
             with open(lock_file, "r") as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=YamlLoader)
                 
             assert data["config"]["param1"] == 1
             assert data["config"]["param2"] == "test"
             assert "timestamp" in data
 
 
+def test_runtracker_save_seeds_run_lock_cache(tmp_path):
+    """A saved run.lock is served from memory and matches a fresh parse."""
+    from flexlock.load_stage import load_run_lock
+
+    tracker = RunTracker(tmp_path)
+    with patch("yaml.load") as mock_parse:
+        tracker.save(OmegaConf.create({"param1": 1, "nested": {"a": [1, 2]}}))
+    mock_parse.assert_not_called()  # saving never re-parses what it dumped
+    lock_file = tmp_path / "run.lock"
+
+    with patch("flexlock.load_stage.yaml.load") as mock_load:
+        cached = load_run_lock(lock_file)
+    mock_load.assert_not_called()
+    assert cached == yaml.load(lock_file.read_text(), Loader=YamlLoader)
+
+
+def test_runtracker_save_enum_values(tmp_path):
+    """Enum values are written as their names."""
+    from dataclasses import dataclass
+    from enum import Enum
+
+    class Mode(Enum):
+        TRAIN = 1
+
+    @dataclass
+    class Cfg:
+        mode: Mode = Mode.TRAIN
+
+    from flexlock.load_stage import load_run_lock
+
+    RunTracker(tmp_path).save(OmegaConf.structured(Cfg))
+    data = yaml.load((tmp_path / "run.lock").read_text(), Loader=YamlLoader)
+    assert data["config"] == {"mode": "TRAIN"}
+    # The seeded cache holds the parsed file, not the in-memory Enum member
+    assert load_run_lock(tmp_path / "run.lock")["config"] == {"mode": "TRAIN"}
+
+
+def test_runtracker_save_path_values(tmp_path):
+    """Path values are written as strings a fresh safe load can read back."""
+    from dataclasses import dataclass
+
+    from flexlock.load_stage import _RUN_LOCK_CACHE, load_run_lock
+
+    @dataclass
+    class Cfg:
+        root: Path = Path("/data/raw")
+
+    tracker = RunTracker(tmp_path)
+    tracker.data["data"] = {"inputs": Path("/data/raw")}
+    tracker.save(OmegaConf.structured(Cfg))
+
+    with patch.dict(_RUN_LOCK_CACHE, clear=True):
+        data = load_run_lock(tmp_path / "run.lock")
+    assert data["config"] == {"root": "/data/raw"}
+    assert data["data"] == {"inputs": "/data/raw"}
+    # The cache seeded by save() holds the same plain values as the file
+    assert load_run_lock(tmp_path / "run.lock") == data
+
+
 def test_snapshot_function_basic():
     """Test the snapshot function."""
     with tempfile.TemporaryDirectory() as tmp:
@@ -147,7 +256,7 @@ def test_snapshot_function_basic():
             assert lock_file.exists()
 
             with open(lock_file, "r") as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=YamlLoader)
 
             assert data["config"]["param"] == 1
             # Check that both repos and data were recorded
@@ -181,7 +290,7 @@ def test_snapshot_function_with_parent():
             assert lock_file.exists()
             
             with open(lock_file, "r") as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=YamlLoader)
                 
             assert data["config"]["param"] == 1
             # Should have parent reference
@@ -219,7 +328,7 @@ def test_snapshot_function_custom_save_path():
             assert lock_file.exists()
             
             with open(lock_file, "r") as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=YamlLoader)
                 
             assert data["config"]["param"] == 1
 
@@ -264,7 +373,7 @@ timestamp: 2023-01-01T00:00:00
             assert lock_file.exists()
             
             with open(lock_file, "r") as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=YamlLoader)
                 
             assert data["config"]["param"] == 1
             # Should have lineage information
@@ -273,64 +382,70 @@ timestamp: 2023-01-01T00:00:00
             assert data["lineage"]["upstream_run"]["path"] == str(upstream_dir)
 
 
-@pytest.fixture
-def git_repo(tmp_path):
-    """Create a temporary git repository for testing."""
-    repo_dir = tmp_path / "test_repo"
+@pytest.fixture(scope="session")
+def _base_git_repo(tmp_path_factory):
+    """Build the initial repository once; each test gets its own copy."""
+    from git import Repo
+
+    repo_dir = tmp_path_factory.mktemp("base") / "test_repo"
     repo_dir.mkdir()
     repo = Repo.init(repo_dir)
 
     initial_file = repo_dir / "README.md"
     initial_file.write_text("Initial commit")
     repo.index.add([str(initial_file)])
-    repo.config_writer().set_value("user", "name", "Test User").release()
-    repo.config_writer().set_value("user", "email", "test@example.com").release()
+    with repo.config_writer() as writer:
+        writer.set_value("user", "name", "Test User")
+        writer.set_value("user", "email", "test@example.com")
     repo.index.commit("Initial commit")
 
-    return repo
+    return repo_dir
 
 
-def test_snapshot_with_real_git(git_repo):
+@pytest.fixture
+def git_repo(tmp_path, _base_git_repo):
+    """Create a temporary git repository for testing."""
+    from git import Repo
+
+    repo_dir = tmp_path / "test_repo"
+    shutil.copytree(_base_git_repo, repo_dir, symlinks=True)
+    return Repo(repo_dir)
+
+
+def test_snapshot_with_real_git(git_repo, tmp_path, monkeypatch):
     """Test snapshot with real git repository."""
     repo_dir = Path(git_repo.working_dir)
-    
-    with tempfile.TemporaryDirectory() as tmp:
-        save_dir = Path(tmp) / "results"
-        save_dir.mkdir()
-        
-        cfg = OmegaConf.create({"param": 1, "save_dir": str(save_dir)})
-        
-        # Create a dummy data file
-        data_file = save_dir / "data.txt"
-        data_file.write_text("test data")
-        
-        # Change to repo directory for git operations
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(repo_dir)
-            
-            snapshot(
-                cfg,
-                repos={"main": {"path": str(repo_dir)}},
-                data={"dataset": str(data_file)}
-            )
-            
-            lock_file = save_dir / "run.lock"
-            assert lock_file.exists()
-            
-            with open(lock_file, "r") as f:
-                data = yaml.safe_load(f)
-                
-            assert data["config"]["param"] == 1
-            assert "repos" in data
-            assert "main" in data["repos"]
-            assert "tree" in data["repos"]["main"]
-            assert "commit" in data["repos"]["main"]
-            assert "data" in data
-            assert "dataset" in data["data"]
-            
-        finally:
-            os.chdir(original_cwd)
+    save_dir = tmp_path / "results"
+    save_dir.mkdir()
+
+    cfg = OmegaConf.create({"param": 1, "save_dir": str(save_dir)})
+
+    # Create a dummy data file
+    data_file = save_dir / "data.txt"
+    data_file.write_text("test data")
+
+    # Change to repo directory for git operations (restored by monkeypatch)
+    monkeypatch.chdir(repo_dir)
+
+    snapshot(
+        cfg,
+        repos={"main": {"path": str(repo_dir)}},
+        data={"dataset": str(data_file)}
+    )
+
+    lock_file = save_dir / "run.lock"
+    assert lock_file.exists()
+
+    with open(lock_file, "r") as f:
+        data = yaml.load(f, Loader=YamlLoader)
+
+    assert data["config"]["param"] == 1
+    assert "repos" in data
+    assert "main" in data["repos"]
+    assert "tree" in data["repos"]["main"]
+    assert "commit" in data["repos"]["main"]
+    assert "data" in data
+    assert "dataset" in data["data"]
 
 
 def test_snapshot_no_save_dir():
@@ -404,7 +519,7 @@ timestamp: 2023-01-01T00:00:00
             assert lock_file.exists()
             
             with open(lock_file, "r") as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=YamlLoader)
                 
             assert data["config"]["param"] == 1
             # Should have lineage information from data paths
@@ -1,6 +1,5 @@
 """Tests for collect_target_include_patterns and _walk_targets."""
 
-import pytest
 from omegaconf import OmegaConf
 
 from flexlock.utils import collect_target_include_patterns, _walk_targets
@@ -1,9 +1,6 @@
 """Tests for utils module functions."""
 
 import argparse
-import dataclasses
-from collections import namedtuple
-from typing import Any
 import pytest
 from omegaconf import DictConfig, OmegaConf
 import tempfile
@@ -17,7 +14,15 @@ try:
 except ImportError:
     ATTR_AVAILABLE = False
 
-from flexlock.utils import to_dictconfig, instantiate, py2cfg, log_to_file
+from flexlock.utils import (
+    to_dictconfig,
+    instantiate,
+    py2cfg,
+    log_to_file,
+    merge_task_into_cfg,
+    split_task_to,
+    YamlDumper,
+)
 
 
 # --- Test Cases for to_dictconfig function ---
@@ -64,6 +69,24 @@ def test_to_dictconfig_dataclass():
     assert result.optional_field == "default"
 
 
+def test_to_dictconfig_dataclass_type_is_cached_but_copied():
+    """Dataclass types reuse a cached schema; each call gets its own copy and warnings."""
+    from dataclasses import dataclass
+
+    @dataclass
+    class Untyped:
+        value: int = 1
+        loose: None = None
+
+    with pytest.warns(UserWarning, match="loose"):
+        first = to_dictconfig(Untyped)
+    with pytest.warns(UserWarning, match="loose"):
+        second = to_dictconfig(Untyped)
+
+    first.value = 2
+    assert second.value == 1
+
+
 def test_to_dictconfig_plain_class():
     """Test conversion of plain class instance to DictConfig."""
 
@@ -108,88 +131,124 @@ def test_to_dictconfig_slots_class():
     assert result.nested.y == [1, 2, 3]
 
 
-def test_to_dictconfig_argparse_namespace():
-    """Test conversion of argparse.Namespace to DictConfig."""
-    args = argparse.Namespace()
-    args.name = "test"
-    args.value = 42
-    args.flag = True
-    args.list_value = [1, 2, 3]
+def test_to_dictconfig_inherited_slots_class():
+    """Slots declared on base classes are collected; private slots are skipped."""
 
-    result = to_dictconfig(args)
+    class Base:
+        __slots__ = ("name", "_cache")
 
-    assert isinstance(result, DictConfig)
-    assert result.name == "test"
-    assert result.value == 42
-    assert result.flag is True
-    assert result.list_value == [1, 2, 3]
+    class Child(Base):
+        __slots__ = "value"
 
+        def __init__(self, name, value):
+            self.name = name
+            self.value = value
+            self._cache = None
 
-def test_to_dictconfig_typing_simple_namespace():
-    """Test conversion of typing.SimpleNamespace to DictConfig."""
-    from types import SimpleNamespace
+    first = to_dictconfig(Child("a", 1))
+    second = to_dictconfig(Child("b", 2))
 
-    ns = SimpleNamespace()
-    ns.name = "test"
-    ns.value = 42
+    assert first == {"name": "a", "value": 1}
+    assert second == {"name": "b", "value": 2}
 
-    result = to_dictconfig(ns)
 
-    assert isinstance(result, DictConfig)
-    assert result.name == "test"
-    assert result.value == 42
+def test_to_dictconfig_converter_cache_does_not_keep_class_alive():
+    """Classes created at runtime can be garbage collected after conversion."""
+    import gc
+    import weakref
 
+    class Temp:
+        __slots__ = ("name",)
 
-def test_to_dictconfig_vanilla_class_attribute():
-    """Test conversion of vanilla class (without dataclass, attrs, etc.) to DictConfig."""
+        def __init__(self, name):
+            self.name = name
 
-    class VanillaClass:
-        param1 = "value1"
-        param2 = 123
-        param3 = {"nested": "value"}
+    assert to_dictconfig(Temp("a")) == {"name": "a"}
+    ref = weakref.ref(Temp)
+    del Temp
+    gc.collect()
+    assert ref() is None
 
-    instance = VanillaClass
-    result = to_dictconfig(instance)
 
-    assert isinstance(result, DictConfig)
-    assert result.param1 == "value1"
-    assert result.param2 == 123
-    assert result.param3.nested == "value"
+def test_to_dictconfig_dataclass_caches_do_not_keep_class_alive():
+    """Converting dataclass instances does not pin their runtime-created types."""
+    import gc
+    import weakref
+    from dataclasses import dataclass
 
+    from flexlock.utils import _structured_for
 
-def test_to_dictconfig_vanilla_typed_class_attribute():
-    """Test conversion of vanilla class (without dataclass, attrs, etc.) to DictConfig."""
+    @dataclass
+    class Temp:
+        value: int = 1
 
-    class VanillaClass:
-        param1: str = "value1"
-        param2: int = 123
-        param3: dict = {"nested": "value"}
+    assert to_dictconfig(Temp()) == {"value": 1}
+    ref = weakref.ref(Temp)
+    del Temp
+    gc.collect()
+    assert ref() is None
+    # Schemas of dataclass types are cached, but only for a bounded number
+    assert _structured_for.cache_info().maxsize == 128
 
-    instance = VanillaClass
-    result = to_dictconfig(instance)
 
-    assert isinstance(result, DictConfig)
-    assert result.param1 == "value1"
-    assert result.param2 == 123
-    assert result.param3.nested == "value"
+class _VanillaClassAttributes:
+    param1 = "value1"
+    param2 = 123
+    param3 = {"nested": "value"}
 
 
-def test_to_dictconfig_vanilla_class():
-    """Test conversion of vanilla class (without dataclass, attrs, etc.) to DictConfig."""
+class _VanillaTypedClassAttributes:
+    param1: str = "value1"
+    param2: int = 123
+    param3: dict = {"nested": "value"}
 
-    class VanillaClass:
-        def __init__(self):
-            self.param1 = "value1"
-            self.param2 = 123
-            self.param3 = {"nested": "value"}
 
-    instance = VanillaClass()
-    result = to_dictconfig(instance)
+class _VanillaInstance:
+    def __init__(self):
+        self.param1 = "value1"
+        self.param2 = 123
+        self.param3 = {"nested": "value"}
+
+
+_VANILLA_EXPECTED = {"param1": "value1", "param2": 123, "param3": {"nested": "value"}}
+
+
+def _argparse_namespace():
+    return argparse.Namespace(name="test", value=42, flag=True, list_value=[1, 2, 3])
+
+
+def _simple_namespace():
+    from types import SimpleNamespace
+
+    return SimpleNamespace(name="test", value=42)
+
+
+@pytest.mark.parametrize(
+    "make_input, expected",
+    [
+        (
+            _argparse_namespace,
+            {"name": "test", "value": 42, "flag": True, "list_value": [1, 2, 3]},
+        ),
+        (_simple_namespace, {"name": "test", "value": 42}),
+        (lambda: _VanillaClassAttributes, _VANILLA_EXPECTED),
+        (lambda: _VanillaTypedClassAttributes, _VANILLA_EXPECTED),
+        (_VanillaInstance, _VANILLA_EXPECTED),
+    ],
+    ids=[
+        "argparse_namespace",
+        "simple_namespace",
+        "vanilla_class_attribute",
+        "vanilla_typed_class_attribute",
+        "vanilla_instance",
+    ],
+)
+def test_to_dictconfig_plain_objects(make_input, expected):
+    """Namespaces and vanilla classes (no dataclass/attrs) convert to their public attributes."""
+    result = to_dictconfig(make_input())
 
     assert isinstance(result, DictConfig)
-    assert result.param1 == "value1"
-    assert result.param2 == 123
-    assert result.param3.nested == "value"
+    assert OmegaConf.to_container(result) == expected
 
 
 def test_to_dictconfig_attrs_class():
@@ -828,7 +887,7 @@ def test_find_run_dir_at_file(tmp_path):
 
     run_dir = tmp_path / "results" / "preprocess"
     run_dir.mkdir(parents=True)
-    (run_dir / "run.lock").write_text(yaml.dump({"config": {}}))
+    (run_dir / "run.lock").write_text(yaml.dump({"config": {}}, Dumper=YamlDumper))
 
     # Data file inside the run dir
     data_file = run_dir / "output" / "data.csv"
@@ -845,7 +904,7 @@ def test_find_run_dir_at_dir(tmp_path):
 
     run_dir = tmp_path / "results" / "train"
     run_dir.mkdir(parents=True)
-    (run_dir / "run.lock").write_text(yaml.dump({"config": {}}))
+    (run_dir / "run.lock").write_text(yaml.dump({"config": {}}, Dumper=YamlDumper))
 
     assert _find_run_dir(str(run_dir)) == str(run_dir)
 
@@ -867,7 +926,7 @@ def test_extract_tracking_info_prevs_from_data_resolves_run_dir(tmp_path):
 
     run_dir = tmp_path / "results" / "preprocess"
     run_dir.mkdir(parents=True)
-    (run_dir / "run.lock").write_text(yaml.dump({"config": {"save_dir": str(run_dir)}}))
+    (run_dir / "run.lock").write_text(yaml.dump({"config": {"save_dir": str(run_dir)}}, Dumper=YamlDumper))
     data_file = run_dir / "output.h5"
     data_file.write_text("data")
 
@@ -900,3 +959,17 @@ def test_extract_tracking_info_prevs_from_data_skips_non_flexlock(tmp_path):
     assert prevs == []
 
 
+def test_merge_task_into_cfg_with_pre_split_keys():
+    """A pre-split task_to path gives the same result as the dot-path and keeps cfg intact."""
+    cfg = OmegaConf.create({"model": {"params": {"lr": 0.1, "depth": 3}}})
+    task = {"lr": 0.01}
+
+    keys = split_task_to("model.params")
+    assert keys == ("model", "params")
+    assert split_task_to(".") == ()
+
+    merged = merge_task_into_cfg(cfg, task, keys)
+    assert merged == merge_task_into_cfg(cfg, task, "model.params")
+    assert merged.model.params.lr == 0.01
+    assert merged.model.params.depth == 3
+    assert cfg.model.params.lr == 0.1